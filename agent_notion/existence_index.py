@@ -0,0 +1,117 @@
+# agent_notion/existence_index.py
+
+import logging
+import re
+import threading
+from typing import Any
+
+from notion_client import Client
+
+from golden_book_retriever.utils.isbn_utils import isbn_key
+from .notion_utils import call_notion
+from .text_utils import sanitize_field_value
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalize a title for existence checks, ignoring case and extra whitespace.
+    """
+    return re.sub(r"\s+", " ", title).strip().casefold()
+
+
+def normalize_author(author: str) -> str:
+    """
+    Normalize an author the way it ends up in the Notion multi-select field.
+    """
+    return sanitize_field_value(author).casefold()
+
+
+class BookExistenceIndex:
+    """
+    In-memory index of the books already present in the Notion database.
+
+    Books are indexed by normalized ISBN and by normalized (title, author)
+    pairs, mirroring the filters used by MissionControl.check_book_existence.
+    """
+
+    def __init__(self) -> None:
+        self.isbns: set[str] = set()
+        self.title_authors: set[tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, notion: Client, database_id: str) -> "BookExistenceIndex":
+        """
+        Build the index from every page of the Notion database.
+
+        Args:
+            notion: The Notion client.
+            database_id: ID of the books database.
+
+        Returns:
+            BookExistenceIndex: The populated index.
+        """
+        index = cls()
+        has_more = True
+        next_cursor = None
+        pages = 0
+
+        while has_more:
+            query: dict[str, Any] = {"database_id": database_id, "page_size": 100}
+            if next_cursor:
+                query["start_cursor"] = next_cursor
+            response = call_notion(notion.databases.query, **query)
+            if isinstance(response, dict) and "results" in response:
+                for page in response["results"]:
+                    index.add_page(page)
+                pages += len(response["results"])
+                has_more = response["has_more"]
+                next_cursor = response["next_cursor"]
+            else:
+                raise TypeError(
+                    f"Unexpected response type from Notion API: {response!r}"
+                )
+
+        logger.info(f"Loaded {pages} existing books into the existence index")
+        return index
+
+    def add_page(self, page: dict[str, Any]) -> None:
+        """Add a Notion database page to the index."""
+        properties: dict[str, Any] = page.get("properties", {})
+        title_parts = properties.get("Название", {}).get("title", [])
+        isbn_parts = properties.get("ISBN", {}).get("rich_text", [])
+        authors = properties.get("Авторы", {}).get("multi_select", [])
+
+        self.add(
+            title="".join(part.get("plain_text", "") for part in title_parts),
+            isbn="".join(part.get("plain_text", "") for part in isbn_parts),
+            authors=[author["name"] for author in authors],
+        )
+
+    def add(self, title: str, isbn: str, authors: list[str]) -> None:
+        """Add a book to the index."""
+        with self._lock:
+            if isbn:
+                self.isbns.add(isbn_key(isbn))
+            if title:
+                normalized_title: str = normalize_title(title)
+                for author in authors:
+                    self.title_authors.add((normalized_title, normalize_author(author)))
+
+    def contains(self, title: str, isbn: str, authors: list[str]) -> bool:
+        """
+        Check whether a book is already in the index.
+
+        The ISBN is used when present, otherwise the title and first author.
+        """
+        with self._lock:
+            if isbn:
+                return isbn_key(isbn) in self.isbns
+            if title and authors:
+                return (
+                    normalize_title(title),
+                    normalize_author(authors[0]),
+                ) in self.title_authors
+        return False
@@ -1,156 +1,240 @@
 # agent_notion/mission_control.py
 
 import os
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Awaitable, TypeGuard
 from notion_client import APIResponseError, Client
 import logging
 import json
 from pathlib import Path
 
-from constants import NOTION_DATABASE_ID
+import constants
+from data.catalog import BookCatalog
+from golden_book_retriever.utils.isbn_utils import isbn_key
+from golden_book_retriever.utils.log_utils import Payload
+from golden_book_retriever.utils.metrics import get_metrics
+from .existence_index import BookExistenceIndex, normalize_author, normalize_title
 from .field_operative import prepare_book_intel, prepare_description_for_notion
+from .notion_utils import NOTION_BASE_URL, call_notion
+from .upload_manifest import UploadManifest, hash_content
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+# Number of locks books are spread over when serializing their uploads
+BOOK_LOCK_STRIPES = 64
+
 
 class MissionControl:
-    def __init__(self) -> None:
-        self.notion = Client(auth=os.environ["NOTION_SECRET"])
-        self.database_id: str = NOTION_DATABASE_ID
+    def __init__(self, preload_index: bool = False) -> None:
+        """
+        Initialize MissionControl with a Notion client.
+
+        Args:
+            preload_index: Load the whole database once and answer existence
+                checks from memory instead of querying Notion for every book.
+        """
+        constants.load_environment()
+        self.notion = Client(
+            auth=os.environ["NOTION_SECRET"],
+            base_url=os.getenv("NOTION_BASE_URL", NOTION_BASE_URL),
+        )
+        self.database_id: str = constants.NOTION_DATABASE_ID
+        self.existence_index: BookExistenceIndex | None = (
+            BookExistenceIndex.load(self.notion, self.database_id)
+            if preload_index
+            else None
+        )
+        # Serializes existence check + upload of the same book across workers.
+        # A fixed set of locks keeps memory flat; books sharing a lock only
+        # wait for each other.
+        self._book_locks: tuple[threading.Lock, ...] = tuple(
+            threading.Lock() for _ in range(BOOK_LOCK_STRIPES)
+        )
 
     def _is_dict_response(self, obj: Any) -> TypeGuard[dict[str, Any]]:
         return isinstance(obj, dict) and "id" in obj
 
     def check_book_existence(self, title: str, isbn: str, authors: list[str]) -> bool:
-        max_retries = 3
-        retries = 0
-
-        while retries < max_retries:
-            try:
-                if isbn:
-                    query_filter = {"property": "ISBN", "rich_text": {"equals": isbn}}
-                elif title and authors:
-                    query_filter = {
-                        "and": [
-                            {"property": "Название", "title": {"equals": title}},
-                            {
-                                "property": "Авторы",
-                                "multi_select": {
-                                    "contains": authors[0] if authors else ""
-                                },
-                            },
-                        ]
-                    }
-                else:
-                    logger.warning(
-                        "Insufficient data to check book existence. Returning False."
-                    )
-                    return False
+        if self.existence_index is not None:
+            with get_metrics().timed("notion_exists", "index"):
+                return self.existence_index.contains(title, isbn, authors)
 
-                logger.debug(
-                    f"Checking book existence with filter: {json.dumps(query_filter, indent=2)}"
+        try:
+            if isbn:
+                query_filter = {"property": "ISBN", "rich_text": {"equals": isbn}}
+            elif title and authors:
+                query_filter = {
+                    "and": [
+                        {"property": "Название", "title": {"equals": title}},
+                        {
+                            "property": "Авторы",
+                            "multi_select": {"contains": authors[0] if authors else ""},
+                        },
+                    ]
+                }
+            else:
+                logger.warning(
+                    "Insufficient data to check book existence. Returning False."
                 )
+                return False
 
-                response = self.notion.databases.query(
-                    database_id=self.database_id, filter=query_filter
+            logger.debug(
+                "Checking book existence with filter: %s", Payload(query_filter)
+            )
+
+            with get_metrics().timed("notion_exists", "notion"):
+                response = call_notion(
+                    self.notion.databases.query,
+                    database_id=self.database_id,
+                    filter=query_filter,
                 )
 
-                if isinstance(response, dict) and "results" in response:
-                    exists = len(response["results"]) > 0
-                    logger.debug(
-                        f"Book existence check result: {'Exists' if exists else 'Does not exist'}"
-                    )
-                    logger.debug(
-                        f"Response from Notion API: {json.dumps(response, indent=2)}"
-                    )
-                    return exists
-                else:
-                    raise TypeError(
-                        f"Unexpected response type from Notion API: {response!r}"
-                    )
-
-            except APIResponseError as e:
-                if e.code == "rate_limited":
-                    logger.warning(
-                        f"Request rate limited. Retrying in 2 seconds... "
-                        f"Attempt {retries + 1}/{max_retries}"
-                    )
-                    time.sleep(2)
-                    retries += 1
-                else:
-                    logger.error(
-                        f"An error occurred while checking book existence: {e}",
-                        exc_info=True,
-                    )
-                    break
-            except TypeError as e:
-                logger.error(
-                    f"Unexpected response type while checking book existence: {e}",
-                    exc_info=True,
+            if isinstance(response, dict) and "results" in response:
+                exists = len(response["results"]) > 0
+                logger.debug(
+                    "Book existence check result: %s (%d matching pages)",
+                    "Exists" if exists else "Does not exist",
+                    len(response["results"]),
+                )
+                return exists
+            else:
+                raise TypeError(
+                    f"Unexpected response type from Notion API: {response!r}"
                 )
-                break
 
-        logger.error("Max retries reached or an error occurred. Exiting mission.")
+        except APIResponseError as e:
+            logger.error(
+                f"An error occurred while checking book existence: {e}",
+                exc_info=True,
+            )
+        except TypeError as e:
+            logger.error(
+                f"Unexpected response type while checking book existence: {e}",
+                exc_info=True,
+            )
+
+        logger.error(f"Existence check failed for {title!r}; treating it as new")
         return False
 
-    def process_book(self, book_data: dict[str, Any]) -> bool:
-        try:
-            title: str = book_data.get("title", "")
-            isbn: str = book_data.get("isbn", "")
-            authors: list[str] = book_data.get("authors", [])
+    def _book_lock(self, title: str, isbn: str, authors: list[str]) -> threading.Lock:
+        if isbn:
+            key: str = isbn_key(isbn)
+        else:
+            first_author: str = normalize_author(authors[0]) if authors else ""
+            key = f"{normalize_title(title)}|{first_author}"
+        return self._book_locks[hash(key) % len(self._book_locks)]
 
-            logger.info(f"Processing book: {title}")
+    def sync_book(self, book_data: dict[str, Any]) -> str | None:
+        """
+        Upload a book unless it already exists in the database.
 
-            if not self.check_book_existence(title, isbn, authors):
-                self.upload_book(book_data)
-                logger.info(f"Book '{title}' successfully processed and uploaded.")
-                return True
-            else:
+        Returns:
+            The ID of the created page, or None if the book already existed.
+        """
+        title: str = book_data.get("title", "")
+        isbn: str = book_data.get("isbn", "")
+        authors: list[str] = book_data.get("authors", [])
+
+        logger.info("Processing book: %s", title)
+
+        with self._book_lock(title, isbn, authors):
+            if self.check_book_existence(title, isbn, authors):
                 logger.info(
-                    f"Book '{title}' already exists in the database. Skipping upload."
+                    "Book '%s' already exists in the database. Skipping upload.", title
                 )
-                return False
+                return None
 
+            page_id: str = self.upload_book(book_data)
+            if self.existence_index is not None:
+                self.existence_index.add(title, isbn, authors)
+
+        logger.info("Book '%s' successfully processed and uploaded.", title)
+        return page_id
+
+    def process_book(self, book_data: dict[str, Any]) -> bool:
+        try:
+            return self.sync_book(book_data) is not None
         except Exception as e:
             logger.exception(
                 f"Error processing book {book_data.get('title', 'Unknown')!r}: {str(e)!r}"
             )
             return False
 
-    def upload_book(self, book_data: dict[str, Any]) -> None:
+    def upload_book(self, book_data: dict[str, Any]) -> str:
         properties: dict[str, Any] = prepare_book_intel(book_data)
-        new_page: Any | Awaitable[Any] = self.notion.pages.create(
-            parent={"database_id": self.database_id}, properties=properties
-        )
+        with get_metrics().timed("notion_create", "notion"):
+            new_page: Any | Awaitable[Any] = call_notion(
+                self.notion.pages.create,
+                parent={"database_id": self.database_id},
+                properties=properties,
+            )
 
         if isinstance(new_page, dict) and "id" in new_page:
             description_blocks = prepare_description_for_notion(
                 book_data.get("description", "")
             )
-            self.notion.blocks.children.append(
-                new_page["id"], children=description_blocks
-            )
+            with get_metrics().timed("notion_append", "notion"):
+                call_notion(
+                    self.notion.blocks.children.append,
+                    new_page["id"],
+                    children=description_blocks,
+                )
+            return new_page["id"]
         else:
             raise TypeError(
                 f"Unexpected response type from Notion API when creating page: {type(new_page)}"
             )
 
-    def process_books_from_directory(self, books_dir: str) -> tuple[int, int]:
+    def process_books_from_directory(
+        self, books_dir: str, workers: int = 1, use_manifest: bool = True
+    ) -> tuple[int, int]:
+        """
+        Upload every book JSON file in a directory.
+
+        Args:
+            books_dir: Directory containing book JSON files.
+            workers: Number of books uploaded concurrently. All workers share
+                the Notion rate limiter.
+            use_manifest: Skip files whose content was already synced according
+                to the directory's upload manifest.
+
+        Returns:
+            The number of processed and uploaded books.
+        """
         books_path = Path(books_dir)
-        total_books = len(list(books_path.glob("*.json")))
+        book_files: list[Path] = list(books_path.glob("*.json"))
+        total_books = len(book_files)
         processed_books = 0
         uploaded_books = 0
+        unchanged_books = 0
+        counters_lock = threading.Lock()
+        manifest = UploadManifest.for_directory(books_dir)
 
-        for book_file in books_path.glob("*.json"):
-            processed_books += 1
-            logger.info(f"Processing file {processed_books}/{total_books}: {book_file}")
+        def process_file(book_file: Path) -> None:
+            nonlocal processed_books, uploaded_books, unchanged_books
+            with counters_lock:
+                processed_books += 1
+                position: int = processed_books
             try:
-                with open(book_file, "r", encoding="utf-8") as f:
-                    book_data = json.load(f)
+                content: bytes = book_file.read_bytes()
+                content_hash: str = hash_content(content)
+                if use_manifest and manifest.is_unchanged(book_file, content_hash):
+                    logger.debug("Skipping unchanged file: %s", book_file)
+                    with counters_lock:
+                        unchanged_books += 1
+                    return
 
-                if self.process_book(book_data):
-                    uploaded_books += 1
+                logger.info(
+                    "Processing file %d/%d: %s", position, total_books, book_file
+                )
+                book_data = json.loads(content.decode("utf-8"))
+
+                page_id: str | None = self.sync_book(book_data)
+                manifest.record(book_file, content_hash, page_id)
+                if page_id is not None:
+                    with counters_lock:
+                        uploaded_books += 1
 
             except json.JSONDecodeError:
                 logger.error(f"Error decoding JSON from file: {book_file}")
@@ -159,4 +243,59 @@ class MissionControl:
                     f"Error processing file {book_file}: {str(e)}", exc_info=True
                 )
 
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="notion-upload"
+        ) as executor:
+            # Consume the iterator so worker exceptions are not silently dropped
+            list(executor.map(process_file, book_files))
+
+        if unchanged_books:
+            logger.info(f"Skipped {unchanged_books} files unchanged since last upload")
+        return processed_books, uploaded_books
+
+    def process_books_from_catalog(
+        self, catalog: BookCatalog, workers: int = 1, only_pending: bool = True
+    ) -> tuple[int, int]:
+        """
+        Upload the books of a catalog.
+
+        Args:
+            catalog: Catalog to read books from.
+            workers: Number of books uploaded concurrently. All workers share
+                the Notion rate limiter.
+            only_pending: Only upload books whose payload changed since they
+                were last synced.
+
+        Returns:
+            The number of processed and uploaded books.
+        """
+        books = catalog.pending_uploads() if only_pending else catalog.books()
+        processed_books = 0
+        uploaded_books = 0
+        counters_lock = threading.Lock()
+
+        def process_entry(entry: tuple[str, dict[str, Any], str]) -> None:
+            nonlocal processed_books, uploaded_books
+            key, book_data, payload_hash = entry
+            with counters_lock:
+                processed_books += 1
+                position: int = processed_books
+            try:
+                logger.info("Processing catalog book %d: %s", position, key)
+                page_id: str | None = self.sync_book(book_data)
+                catalog.mark_uploaded(key, payload_hash, page_id)
+                if page_id is not None:
+                    with counters_lock:
+                        uploaded_books += 1
+            except Exception as e:
+                logger.error(
+                    f"Error processing catalog book {key}: {str(e)}", exc_info=True
+                )
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="notion-upload"
+        ) as executor:
+            # Consume the iterator so worker exceptions are not silently dropped
+            list(executor.map(process_entry, books))
+
         return processed_books, uploaded_books
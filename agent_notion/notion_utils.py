@@ -1,6 +1,51 @@
 # notion_utils.py
 
-from typing import Any
+import logging
+import time
+from typing import Any, Callable
+
+from notion_client import APIResponseError
+
+from golden_book_retriever.utils.rate_limiter import get_rate_limiter
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Host used to pace Notion API calls through the shared rate limiter
+NOTION_HOST = "api.notion.com"
+# Overridable with the NOTION_BASE_URL environment variable, e.g. for a stand-in
+NOTION_BASE_URL = "https://api.notion.com"
+NOTION_MAX_RETRIES = 5
+
+
+def call_notion(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Call a Notion API endpoint through the shared rate limiter.
+
+    Requests answered with `rate_limited` are retried with backoff, honouring
+    the Retry-After header. Any other API error is raised immediately.
+
+    Raises:
+        APIResponseError: If the request fails, is still rate limited after
+            NOTION_MAX_RETRIES retries, or Notion asks to wait longer than
+            MAX_RETRY_AFTER.
+    """
+    limiter = get_rate_limiter()
+    for attempt in range(NOTION_MAX_RETRIES + 1):
+        limiter.acquire(NOTION_HOST)
+        try:
+            response = func(*args, **kwargs)
+        except APIResponseError as e:
+            if e.code != "rate_limited" or attempt == NOTION_MAX_RETRIES:
+                raise
+            delay: float | None = limiter.throttled(
+                NOTION_HOST, attempt, e.headers.get("Retry-After")
+            )
+            if delay is None:
+                raise
+            time.sleep(delay)
+        else:
+            limiter.success(NOTION_HOST)
+            return response
 
 
 def prepare_multiselect_field(field_name: str, values: list[str]) -> dict[str, Any]:
@@ -0,0 +1,78 @@
+# agent_notion/upload_manifest.py
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".upload_manifest.jsonl"
+
+
+def hash_content(content: bytes) -> str:
+    """
+    Hash the content of a book file.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+class UploadManifest:
+    """
+    Record of book files already synced to Notion.
+
+    Maps each file path to the hash of the content that was synced and the ID
+    of the Notion page created for it (None if the book already existed).
+    Entries are appended to a JSON Lines file as books are synced, so an
+    interrupted upload keeps everything recorded up to that point.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Load the manifest, creating it on first write.
+
+        Args:
+            path: Path to the manifest file.
+        """
+        self.path: Path = path
+        self.entries: dict[str, dict[str, str | None]] = {}
+        self._lock = threading.Lock()
+
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A partially written last line from an interrupted run
+                        logger.warning(f"Skipping corrupt manifest line in {path}")
+                        continue
+                    self.entries[entry["file"]] = {
+                        "hash": entry["hash"],
+                        "page_id": entry.get("page_id"),
+                    }
+            logger.debug(f"Loaded {len(self.entries)} entries from {path}")
+
+    @classmethod
+    def for_directory(cls, books_dir: str) -> "UploadManifest":
+        """Load the manifest kept inside a books directory."""
+        return cls(Path(books_dir) / MANIFEST_FILENAME)
+
+    def is_unchanged(self, book_file: Path, content_hash: str) -> bool:
+        """Check whether a file was already synced with the same content."""
+        with self._lock:
+            entry = self.entries.get(book_file.name)
+        return entry is not None and entry["hash"] == content_hash
+
+    def record(self, book_file: Path, content_hash: str, page_id: str | None) -> None:
+        """Record a synced file and append it to the manifest file."""
+        entry: dict[str, str | None] = {
+            "file": book_file.name,
+            "hash": content_hash,
+            "page_id": page_id,
+        }
+        with self._lock:
+            self.entries[book_file.name] = {"hash": content_hash, "page_id": page_id}
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
@@ -1,12 +1,20 @@
 # agent_notion/uploader.py
 
 import logging
+
+from data.catalog import BookCatalog
 from .mission_control import MissionControl
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 
-def upload_books_to_notion(books_dir: str) -> None:
+def upload_books_to_notion(
+    books_dir: str,
+    preload_index: bool = False,
+    workers: int = 1,
+    use_manifest: bool = True,
+    catalog: BookCatalog | None = None,
+) -> None:
     """
     Upload books from a directory to Notion.
 
@@ -15,14 +23,25 @@ def upload_books_to_notion(books_dir: str) -> None:
 
     Args:
         books_dir (str): Path to the directory containing book JSON files.
+        preload_index (bool): Load the Notion database once up front and check
+            for existing books locally.
+        workers (int): Number of books uploaded concurrently.
+        use_manifest (bool): Skip files unchanged since they were last synced.
+        catalog (BookCatalog | None): Catalog to upload books from instead of
+            the directory.
     """
-    mission_control = MissionControl()
-
-    logger.info(f"Starting to process books from directory: {books_dir}")
-
-    processed_books, uploaded_books = mission_control.process_books_from_directory(
-        books_dir
-    )
+    mission_control = MissionControl(preload_index=preload_index)
+
+    if catalog is not None:
+        logger.info(f"Starting to process books from catalog: {catalog.path}")
+        processed_books, uploaded_books = mission_control.process_books_from_catalog(
+            catalog, workers=workers, only_pending=use_manifest
+        )
+    else:
+        logger.info(f"Starting to process books from directory: {books_dir}")
+        processed_books, uploaded_books = mission_control.process_books_from_directory(
+            books_dir, workers=workers, use_manifest=use_manifest
+        )
 
     logger.info(
         f"Book upload mission completed. Processed {processed_books} books,"
@@ -0,0 +1,169 @@
+# bench/import_time.py
+"""
+Import-time regression check for the main.py entry point.
+
+Run from the repository root:
+
+    python -m bench.import_time
+    python -m bench.import_time --budget-ms 60 --repeat 5
+
+Every check imports what one command needs in a fresh interpreter started
+with `-X importtime`. A check fails if it loads a module reserved for another
+command (e.g. notion_client for a single-ISBN fetch), or if the startup check
+exceeds the optional time budget.
+"""
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_ROOT: Path = Path(__file__).resolve().parent.parent
+
+# Modules only the upload command may load
+UPLOAD_MODULES: tuple[str, ...] = ("agent_notion", "notion_client")
+# Modules only the fetch commands may load
+FETCH_MODULES: tuple[str, ...] = (
+    "book_processor",
+    "bs4",
+    "golden_book_retriever.retriever",
+    "golden_book_retriever.sources",
+    "requests",
+)
+
+
+@dataclass
+class ImportCheck:
+    """
+    One interpreter start to measure.
+
+    Attributes:
+        name: Name shown in the report.
+        argv: Arguments passed to the interpreter after `-X importtime`.
+        forbidden: Packages or modules the check must not load.
+    """
+
+    name: str
+    argv: list[str]
+    forbidden: tuple[str, ...]
+
+
+CHECKS: tuple[ImportCheck, ...] = (
+    # Both commands load .env, but only once they run
+    ImportCheck(
+        "startup", ["main.py", "--help"], ("dotenv",) + UPLOAD_MODULES + FETCH_MODULES
+    ),
+    ImportCheck(
+        "fetch",
+        ["-c", "import book_processor, golden_book_retriever.retriever"],
+        UPLOAD_MODULES,
+    ),
+    ImportCheck(
+        "upload",
+        ["-c", "import agent_notion.uploader, data.catalog"],
+        FETCH_MODULES,
+    ),
+)
+
+
+@dataclass
+class ImportReport:
+    name: str
+    total_us: int
+    modules: dict[str, int]
+    error: str | None = None
+
+
+def measure(check: ImportCheck) -> ImportReport:
+    """
+    Run a check once and parse the `-X importtime` output.
+
+    Returns:
+        ImportReport: Self time of every imported module in microseconds and
+            their sum, or the interpreter's error output if it failed.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *check.argv],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    modules: dict[str, int] = {}
+    other_lines: list[str] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            other_lines.append(line)
+            continue
+        fields: list[str] = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        modules[fields[2].strip()] = int(fields[0])
+    error: str | None = (
+        "\n".join(other_lines) or f"exit status {result.returncode}"
+        if result.returncode != 0
+        else None
+    )
+    return ImportReport(check.name, sum(modules.values()), modules, error)
+
+
+def forbidden_imports(report: ImportReport, forbidden: tuple[str, ...]) -> list[str]:
+    """List the modules of a report that belong to a forbidden package."""
+    return sorted(
+        module
+        for module in report.modules
+        if any(module == name or module.startswith(f"{name}.") for name in forbidden)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check which modules and how much import time each command pays"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per check; the fastest one is reported",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        help="Fail if the startup check imports for longer than this",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Slowest modules listed per check"
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    failed = False
+    for check in CHECKS:
+        reports: list[ImportReport] = [
+            measure(check) for _ in range(max(1, args.repeat))
+        ]
+        report: ImportReport = min(reports, key=lambda r: r.total_us)
+        print(f"\n{check.name}: {report.total_us / 1000:.1f} ms import time")
+        if report.error is not None:
+            print(f"  FAILED to run:\n{report.error}")
+            failed = True
+            continue
+        slowest = sorted(report.modules.items(), key=lambda item: -item[1])
+        for module, self_us in slowest[: args.top]:
+            print(f"  {self_us / 1000:>7.1f} ms  {module}")
+        loaded: list[str] = forbidden_imports(report, check.forbidden)
+        if loaded:
+            print(f"  FAILED: loads {', '.join(loaded)}")
+            failed = True
+        if (
+            check.name == "startup"
+            and args.budget_ms is not None
+            and report.total_us > args.budget_ms * 1000
+        ):
+            print(f"  FAILED: over the budget of {args.budget_ms:.1f} ms")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+# bench/run_benchmark.py
+"""
+End-to-end throughput benchmark against the local stand-in services.
+
+Run from the repository root:
+
+    python -m bench.run_benchmark --books 500 --workers 8
+
+Books are fetched with BookProcessor.process_file and uploaded with
+upload_books_to_notion. Everything is written to a temporary working
+directory, so the real data directory and Notion database are not touched.
+"""
+
+import argparse
+import functools
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from .standin_server import StandInConfig, StandInServer
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Rate used for every host, so the benchmark measures the pipeline itself
+UNTHROTTLED_RATE: float = 1_000_000.0
+
+
+def _isbn13(n: int) -> str:
+    digits: str = f"978{n:09d}"
+    total: int = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(digits))
+    return f"{digits}{(10 - total % 10) % 10}"
+
+
+class LatencyRecorder:
+    """Collects the wall-clock duration of every call of wrapped functions."""
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self._lock = threading.Lock()
+
+    def wrap(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start: float = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed: float = time.perf_counter() - start
+                with self._lock:
+                    self.latencies.append(elapsed)
+
+        return timed
+
+
+def _summarize(
+    name: str,
+    elapsed: float,
+    latencies: list[float],
+    requests: dict[str, dict[str, int]],
+) -> dict[str, Any]:
+    ordered: list[float] = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "phase": name,
+        "books": len(ordered),
+        "elapsed_s": round(elapsed, 3),
+        "books_per_s": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(percentile(0.50) * 1000, 1),
+        "latency_p95_ms": round(percentile(0.95) * 1000, 1),
+        "latency_mean_ms": (
+            round(statistics.fmean(ordered) * 1000, 1) if ordered else 0.0
+        ),
+        "requests": requests,
+    }
+
+
+def _print_summary(summary: dict[str, Any]) -> None:
+    print(
+        f"\n{summary['phase']}: {summary['books']} books in "
+        f"{summary['elapsed_s']:.2f}s = {summary['books_per_s']:.2f} books/s"
+    )
+    print(
+        f"  latency p50 {summary['latency_p50_ms']:.1f} ms, "
+        f"p95 {summary['latency_p95_ms']:.1f} ms, "
+        f"mean {summary['latency_mean_ms']:.1f} ms"
+    )
+    for route, stats in summary["requests"].items():
+        print(
+            f"  {route:<22} {stats['requests']:>7} requests "
+            f"{stats['errors']:>5} errors {stats['bytes_sent'] / 1024:>10.1f} KiB"
+        )
+
+
+def run_benchmark(args: argparse.Namespace) -> list[dict[str, Any]]:
+    server = StandInServer(
+        StandInConfig(
+            latency=args.latency / 1000,
+            jitter=args.jitter / 1000,
+            error_rate=args.error_rate,
+            fixtures_dir=Path(args.fixtures).resolve() if args.fixtures else None,
+        )
+    )
+    base_url: str = server.start()
+
+    # Configuration read by the pipeline at import or construction time
+    os.environ.update(
+        {
+            "ENVIRONMENT": "TESTING",
+            "TESTING_DATABASE_ID": "standin-database",
+            "NOTION_SECRET": "standin-secret",
+            "NOTION_BASE_URL": base_url,
+            "GOOGLE_BOOKS_API_KEY": "standin-key",
+        }
+    )
+
+    from agent_notion.mission_control import MissionControl
+    from agent_notion.notion_utils import NOTION_HOST
+    from agent_notion.uploader import upload_books_to_notion
+    from book_processor import BookProcessor
+    from golden_book_retriever.retriever import Retriever
+    from golden_book_retriever.sources import (
+        GoodreadsScraper,
+        GoogleBooksAPI,
+        OpenLibraryAPI,
+    )
+    from golden_book_retriever.utils.http_session import (
+        DEFAULT_POOL_MAXSIZE,
+        configure_session,
+    )
+    from golden_book_retriever.utils.rate_limiter import configure_rate_limiter
+
+    OpenLibraryAPI.BASE_URL = f"{base_url}/search.json"
+    GoogleBooksAPI.BASE_URL = f"{base_url}/books/v1/volumes"
+    GoodreadsScraper.BASE_URL = f"{base_url}/book/isbn/"
+    standin_host: str = base_url.split("://", 1)[1]
+    configure_rate_limiter(
+        {standin_host: UNTHROTTLED_RATE, NOTION_HOST: UNTHROTTLED_RATE}
+    )
+    configure_session(pool_maxsize=max(DEFAULT_POOL_MAXSIZE, args.workers * 3))
+
+    summaries: list[dict[str, Any]] = []
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix="bookscrapper-bench-"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    os.chdir(work_dir)
+    logger.info(f"Benchmark working directory: {work_dir}")
+
+    try:
+        isbn_file = Path("isbns.txt")
+        isbn_file.write_text(
+            "\n".join(_isbn13(n) for n in range(args.books)) + "\n", encoding="utf-8"
+        )
+
+        fetch_latencies = LatencyRecorder()
+        processor = BookProcessor(Retriever(workers=args.workers))
+        processor.process_isbn = fetch_latencies.wrap(processor.process_isbn)
+        server.stats.reset()
+        start: float = time.perf_counter()
+        processor.process_file(
+            str(isbn_file), processor.process_isbn, workers=args.workers
+        )
+        summaries.append(
+            _summarize(
+                "fetch",
+                time.perf_counter() - start,
+                fetch_latencies.latencies,
+                server.stats.snapshot(),
+            )
+        )
+
+        if not args.skip_upload:
+            upload_latencies = LatencyRecorder()
+            sync_book = upload_latencies.wrap(MissionControl.sync_book)
+            MissionControl.sync_book = sync_book  # type: ignore[method-assign]
+            server.stats.reset()
+            start = time.perf_counter()
+            upload_books_to_notion(
+                "data/books", workers=args.workers, use_manifest=False
+            )
+            summaries.append(
+                _summarize(
+                    "upload",
+                    time.perf_counter() - start,
+                    upload_latencies.latencies,
+                    server.stats.snapshot(),
+                )
+            )
+    finally:
+        server.stop()
+
+    return summaries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure pipeline throughput against local stand-in services"
+    )
+    parser.add_argument("--books", type=int, default=200, help="Number of ISBNs")
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Books processed concurrently"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=50.0, help="Base response latency in ms"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=20.0, help="Maximum extra random latency in ms"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with a throttling error",
+    )
+    parser.add_argument(
+        "--fixtures", type=str, help="Directory of recorded responses to serve"
+    )
+    parser.add_argument(
+        "--work-dir", type=str, help="Working directory (default: a temporary one)"
+    )
+    parser.add_argument(
+        "--skip-upload", action="store_true", help="Only benchmark fetching"
+    )
+    parser.add_argument("--json", type=str, help="Also write the results to a file")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logs")
+    args: argparse.Namespace = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+
+    if args.json:
+        # The benchmark changes into its working directory
+        args.json = str(Path(args.json).resolve())
+    summaries: list[dict[str, Any]] = run_benchmark(args)
+    for summary in summaries:
+        _print_summary(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+# bench/standin_server.py
+
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+ISBN_PATTERN: re.Pattern[str] = re.compile(r"[0-9X]{10,13}")
+
+
+@dataclass
+class StandInConfig:
+    """
+    Behaviour of the stand-in services.
+
+    Attributes:
+        latency: Base response delay in seconds.
+        jitter: Maximum random delay in seconds added to the base latency.
+        error_rate: Fraction of requests answered with a throttling error
+            (503 for the book sources, 429 rate_limited for Notion).
+        fixtures_dir: Directory of recorded responses. Files named
+            openlibrary/<isbn>.json, googlebooks/<isbn>.json and
+            goodreads/<isbn>.html are served instead of generated ones.
+        page_padding: Bytes of filler markup around the Goodreads
+            __NEXT_DATA__ script, to approximate the size of a real page.
+    """
+
+    latency: float = 0.05
+    jitter: float = 0.02
+    error_rate: float = 0.0
+    fixtures_dir: Path | None = None
+    page_padding: int = 60_000
+
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    errors: int = 0
+    bytes_sent: int = 0
+
+
+@dataclass
+class StandInStats:
+    routes: dict[str, RouteStats] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, route: str, status: int, size: int) -> None:
+        with self.lock:
+            stats: RouteStats = self.routes.setdefault(route, RouteStats())
+            stats.requests += 1
+            stats.errors += status >= 400
+            stats.bytes_sent += size
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self.lock:
+            return {
+                route: {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "bytes_sent": stats.bytes_sent,
+                }
+                for route, stats in sorted(self.routes.items())
+            }
+
+    def reset(self) -> None:
+        with self.lock:
+            self.routes.clear()
+
+
+def _seed(value: str) -> int:
+    return int(hashlib.md5(value.encode()).hexdigest()[:8], 16)
+
+
+def _openlibrary_doc(isbn: str) -> dict[str, Any]:
+    n: int = _seed(isbn)
+    return {
+        "key": f"/works/OL{n}W",
+        "title": f"Stand-in Book {isbn}",
+        "author_name": [f"Stand-in Author {n % 500}"],
+        "first_publish_year": 1950 + n % 70,
+        "cover_i": n,
+        "number_of_pages_median": 100 + n % 400,
+        "edition_count": 1 + n % 12,
+        "isbn": [isbn],
+        "language": ["eng"],
+        "publisher": [f"Stand-in Press {n % 40}"],
+        "subject": ["Fiction", "LGBTQ+", f"Subject {n % 30}"],
+    }
+
+
+def _googlebooks_item(isbn: str) -> dict[str, Any]:
+    n: int = _seed(isbn)
+    return {
+        "volumeInfo": {
+            "title": f"Stand-in Book {isbn}",
+            "authors": [f"Stand-in Author {n % 500}"],
+            "publisher": f"Stand-in Press {n % 40}",
+            "publishedDate": str(1950 + n % 70),
+            "description": f"A generated description of book {isbn}. " * 8,
+            "industryIdentifiers": [{"type": "ISBN_13", "identifier": isbn}],
+            "pageCount": 100 + n % 400,
+            "categories": ["Fiction"],
+            "imageLinks": {"thumbnail": f"https://example.invalid/{n}.jpg"},
+            "language": "en",
+            "infoLink": f"https://example.invalid/books/{n}",
+        }
+    }
+
+
+def _goodreads_page(isbn: str, padding: int) -> bytes:
+    n: int = _seed(isbn)
+    apollo_state: dict[str, Any] = {
+        f"Book:kca://book/{n}": {
+            "title": f"Stand-in Book {isbn}",
+            "description": f"<p>A <b>generated</b> description of {isbn}.</p>" * 8,
+            "imageUrl": f"https://example.invalid/{n}.jpg",
+            "webUrl": f"https://www.goodreads.com/book/show/{n}",
+            "details": {
+                "numPages": 100 + n % 400,
+                "isbn13": isbn,
+                "language": {"name": "English"},
+                "publisher": f"Stand-in Press {n % 40}",
+                "publicationTime": 1_000_000_000_000 + n,
+            },
+            "bookGenres": [
+                {"genre": {"name": name}} for name in ("Fiction", "Queer", "Romance")
+            ],
+        },
+        f"Contributor:kca://author/{n % 500}": {"name": f"Stand-in Author {n % 500}"},
+        f"Series:kca://series/{n % 90}": {"title": f"Stand-in Series {n % 90}"},
+    }
+    next_data: str = json.dumps({"props": {"pageProps": {"apolloState": apollo_state}}})
+    filler: str = "<div class='filler'></div>" * (padding // 26)
+    return (
+        f"<!DOCTYPE html><html><head><title>{isbn}</title></head><body>{filler}"
+        f'<script id="__NEXT_DATA__" type="application/json">{next_data}</script>'
+        f"{filler}</body></html>"
+    ).encode("utf-8")
+
+
+class StandInServer:
+    """
+    Local HTTP server imitating the services the pipeline talks to.
+
+    Serves the Open Library search API, the Google Books volumes API,
+    Goodreads book pages with a __NEXT_DATA__ payload and the Notion
+    endpoints used by MissionControl. Responses are generated per ISBN, or
+    read from recorded fixtures, and delayed according to the configuration.
+    Request counts per route are available from `stats` and from GET /__stats.
+    """
+
+    def __init__(
+        self, config: StandInConfig, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        """
+        Create the server. It does not accept requests until `start`.
+
+        Args:
+            config: Latency, jitter, error rate and fixtures settings.
+            host: Interface to listen on.
+            port: Port to listen on; 0 picks a free one.
+        """
+        self.config: StandInConfig = config
+        self.stats = StandInStats()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """
+        Start serving in a background thread.
+
+        Returns:
+            The base URL of the server.
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="standin-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Stand-in server listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _fixture(self, service: str, name: str) -> bytes | None:
+        if self.config.fixtures_dir is None:
+            return None
+        path: Path = self.config.fixtures_dir / service / name
+        return path.read_bytes() if path.exists() else None
+
+    def _delay(self) -> None:
+        time.sleep(self.config.latency + random.uniform(0, self.config.jitter))
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        standin: StandInServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so the pooled session reuses its connections
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                self._dispatch("GET")
+
+            def do_POST(self) -> None:
+                self._dispatch("POST")
+
+            def do_PATCH(self) -> None:
+                self._dispatch("PATCH")
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(format % args)
+
+            def _send(
+                self,
+                route: str,
+                status: int,
+                body: bytes,
+                content_type: str = "application/json",
+                headers: dict[str, str] | None = None,
+            ) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+                standin.stats.record(route, status, len(body))
+
+            def _send_json(self, route: str, data: Any, status: int = 200) -> None:
+                self._send(route, status, json.dumps(data).encode("utf-8"))
+
+            def _dispatch(self, method: str) -> None:
+                url = urlsplit(self.path)
+                query: dict[str, list[str]] = parse_qs(url.query)
+                length = int(self.headers.get("Content-Length") or 0)
+                # Drain the body so the connection can be reused
+                body: bytes = self.rfile.read(length) if length else b""
+
+                if url.path == "/__stats":
+                    payload = json.dumps(standin.stats.snapshot()).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+
+                route: str | None = self._route(method, url.path)
+                if route is None:
+                    self._send_json(f"{method} unknown", {"error": "not found"}, 404)
+                    return
+
+                standin._delay()
+                if random.random() < standin.config.error_rate:
+                    self._send_error(route)
+                    return
+
+                handler = getattr(self, f"_handle_{route.split()[0]}")
+                handler(route, url.path, query, body)
+
+            @staticmethod
+            def _route(method: str, path: str) -> str | None:
+                if method == "GET" and path == "/search.json":
+                    return "openlibrary search"
+                if method == "GET" and path == "/books/v1/volumes":
+                    return "googlebooks volumes"
+                if method == "GET" and path.startswith("/book/isbn/"):
+                    return "goodreads page"
+                if method == "POST" and re.fullmatch(
+                    r"/v1/databases/[^/]+/query", path
+                ):
+                    return "notion query"
+                if method == "POST" and path == "/v1/pages":
+                    return "notion create_page"
+                if method == "PATCH" and re.fullmatch(
+                    r"/v1/blocks/[^/]+/children", path
+                ):
+                    return "notion append_blocks"
+                return None
+
+            def _send_error(self, route: str) -> None:
+                if route.startswith("notion"):
+                    self._send(
+                        route,
+                        429,
+                        json.dumps(
+                            {
+                                "object": "error",
+                                "status": 429,
+                                "code": "rate_limited",
+                                "message": "Stand-in rate limit",
+                            }
+                        ).encode("utf-8"),
+                        headers={"Retry-After": "0"},
+                    )
+                else:
+                    self._send(route, 503, b"{}", headers={"Retry-After": "0"})
+
+            def _handle_openlibrary(
+                self, route: str, path: str, query: dict[str, list[str]], body: bytes
+            ) -> None:
+                isbns: list[str] = ISBN_PATTERN.findall(query.get("q", [""])[0])
+                docs: list[dict[str, Any]] = []
+                for isbn in isbns:
+                    recorded = standin._fixture("openlibrary", f"{isbn}.json")
+                    if recorded is not None:
+                        docs.extend(json.loads(recorded).get("docs", []))
+                    else:
+                        docs.append(_openlibrary_doc(isbn))
+                self._send_json(route, {"numFound": len(docs), "docs": docs})
+
+            def _handle_googlebooks(
+                self, route: str, path: str, query: dict[str, list[str]], body: bytes
+            ) -> None:
+                isbns: list[str] = ISBN_PATTERN.findall(query.get("q", [""])[0])
+                if not isbns:
+                    self._send_json(route, {})
+                    return
+                recorded = standin._fixture("googlebooks", f"{isbns[0]}.json")
+                if recorded is not None:
+                    self._send(route, 200, recorded)
+                else:
+                    self._send_json(route, {"items": [_googlebooks_item(isbns[0])]})
+
+            def _handle_goodreads(
+                self, route: str, path: str, query: dict[str, list[str]], body: bytes
+            ) -> None:
+                isbn: str = path.rsplit("/", 1)[-1]
+                page: bytes | None = standin._fixture("goodreads", f"{isbn}.html")
+                if page is None:
+                    page = _goodreads_page(isbn, standin.config.page_padding)
+                self._send(route, 200, page, "text/html; charset=utf-8")
+
+            def _handle_notion(
+                self, route: str, path: str, query: dict[str, list[str]], body: bytes
+            ) -> None:
+                if route == "notion create_page":
+                    self._send_json(
+                        route,
+                        {"object": "page", "id": str(uuid.uuid4()), "properties": {}},
+                    )
+                else:
+                    # Every book is new to the stand-in database
+                    self._send_json(
+                        route,
+                        {
+                            "object": "list",
+                            "results": [],
+                            "has_more": False,
+                            "next_cursor": None,
+                        },
+                    )
+
+        return Handler
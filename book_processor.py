@@ -2,14 +2,38 @@ import hashlib
 import json
 import logging
 import re
+import threading
+import time
 import traceback
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Callable
-
+from typing import Any, Callable, Iterator, TextIO, TypeVar
+
+from checkpoint_journal import (
+    OUTCOME_DONE,
+    OUTCOME_ERROR,
+    OUTCOME_NO_DATA,
+    CheckpointJournal,
+)
+from data.catalog import BookCatalog
 from golden_book_retriever.retriever import Retriever
+from golden_book_retriever.sources.goodreads.export import read_goodreads_export
+from golden_book_retriever.utils.log_utils import Payload
+from golden_book_retriever.utils.metrics import get_metrics
+from isbn_index import IsbnIndex
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+# Number of ISBN file lines read ahead and resolved in one batch lookup
+PREFETCH_CHUNK_SIZE = 50
+
+# Seconds between flushes of the ISBN index while a file is processed
+ISBN_INDEX_FLUSH_INTERVAL = 30.0
+
+# Value of an input file item, e.g. an ISBN or a book of a Goodreads export
+T = TypeVar("T")
+
 
 class SetEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle sets."""
@@ -24,14 +48,25 @@ class SetEncoder(json.JSONEncoder):
 class BookProcessor:
     """Handles processing and saving of book data."""
 
-    def __init__(self, retriever: Retriever) -> None:
+    def __init__(
+        self,
+        retriever: Retriever,
+        isbn_index: IsbnIndex | None = None,
+        catalog: BookCatalog | None = None,
+    ) -> None:
         """
         Initialize BookProcessor with a retriever.
 
         Args:
             retriever: An instance of a book data retriever.
+            isbn_index: Index of already fetched ISBNs. ISBNs found in it are
+                skipped; None disables skipping.
+            catalog: Catalog to save books to. If None, each book is saved as
+                a JSON file in data/books.
         """
         self.retriever: Retriever = retriever
+        self.isbn_index: IsbnIndex | None = isbn_index
+        self.catalog: BookCatalog | None = catalog
 
     def generate_filename(self, title: str, authors: set[str]) -> str:
         # Sanitize the title
@@ -54,7 +89,10 @@ class BookProcessor:
             base_filename = base_filename[:50]
 
         # Create a hash of the full title and all authors
-        full_hash: str = hashlib.md5(f"{title}{'|'.join(authors)}".encode()).hexdigest()
+        # Authors are sorted so the hash does not depend on set iteration order
+        full_hash: str = hashlib.md5(
+            f"{title}{'|'.join(sorted(authors))}".encode()
+        ).hexdigest()
 
         # Use the first 8 characters of the hash to ensure uniqueness
         unique_filename: str = f"{base_filename}_{full_hash[:8]}"
@@ -63,98 +101,374 @@ class BookProcessor:
 
     def process_book_data(
         self, book_data: dict[str, Any] | None, search_term: str
-    ) -> None:
+    ) -> bool:
         if not book_data:
             logger.warning(f"No data found for {search_term!r}")
-            return
+            return False
 
         title = book_data.get("title")
         authors: set[str] = book_data.get("authors", set())
 
         if not title:
-            logger.warning(f"No title found for {search_term!r}. Raw data: {book_data}")
-            return
+            logger.warning(
+                "No title found for %r. Raw data: %s", search_term, Payload(book_data)
+            )
+            return False
 
         filename: str = self.generate_filename(title, authors)
-        output_dir = Path("data/books")
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_file: Path = output_dir / f"{filename}.json"
 
-        try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(book_data, f, ensure_ascii=False, indent=2, cls=SetEncoder)
-            logger.info(f"Data for {search_term!r} saved to {output_file}")
-        except Exception as e:
-            logger.error(f"Error saving data for {search_term!r}: {str(e)}")
-            logger.debug(f"Problematic data: {book_data}")
-
-    def process_isbn(self, isbn: str) -> None:
+        backend: str = "catalog" if self.catalog is not None else "file"
+        with get_metrics().timed("write", backend) as timer:
+            try:
+                if self.catalog is not None:
+                    self.catalog.put(filename, book_data)
+                    logger.info("Data for %r saved to the catalog", search_term)
+                else:
+                    output_dir = Path("data/books")
+                    output_dir.mkdir(parents=True, exist_ok=True)
+                    output_file: Path = output_dir / f"{filename}.json"
+                    with open(output_file, "w", encoding="utf-8") as f:
+                        json.dump(
+                            book_data, f, ensure_ascii=False, indent=2, cls=SetEncoder
+                        )
+                    logger.info("Data for %r saved to %s", search_term, output_file)
+            except Exception as e:
+                logger.error(f"Error saving data for {search_term!r}: {str(e)}")
+                logger.debug("Problematic data: %s", Payload(book_data))
+                timer.fail()
+                return False
+
+        if self.isbn_index is not None and book_data.get("isbn"):
+            self.isbn_index.add(book_data["isbn"])
+        return True
+
+    def process_isbn(self, isbn: str) -> bool:
         """
         Process a single ISBN.
 
         Args:
             isbn: The ISBN to process.
+
+        Returns:
+            True if the book was saved or had been fetched before.
         """
-        logger.debug(f"Fetching data for ISBN: {isbn}")
-        book_data: dict[str, Any] | None = self.retriever.fetch_by_isbn(isbn)
-        self.process_book_data(book_data, f"ISBN {isbn}")
+        if self.isbn_index is not None and self.isbn_index.contains(isbn):
+            logger.info("ISBN %s was already fetched. Skipping.", isbn)
+            return True
 
-    def process_goodreads_url(self, url: str) -> None:
+        logger.debug("Fetching data for ISBN: %s", isbn)
+        book_data: dict[str, Any] | None = self.retriever.fetch_by_isbn(isbn)
+        if not self.process_book_data(book_data, f"ISBN {isbn}"):
+            return False
+        if self.isbn_index is not None:
+            # The merged record may carry a different edition's ISBN
+            self.isbn_index.add(isbn)
+        return True
+
+    def process_goodreads_url(self, url: str) -> bool:
         """
         Process a single Goodreads URL.
 
         Args:
             url: The Goodreads URL to process.
+
+        Returns:
+            True if the book was saved.
         """
-        logger.debug(f"Fetching data for Goodreads URL: {url}")
+        logger.debug("Fetching data for Goodreads URL: %s", url)
         book_data: dict[str, Any] | None = self.retriever.fetch_by_goodreads_url(url)
+        saved = False
         if book_data:
-            self.process_book_data(book_data, f"Goodreads URL {url}")
+            saved = self.process_book_data(book_data, f"Goodreads URL {url}")
         else:
             logger.warning(f"No data found for Goodreads URL: {url}")
 
         # Ensure Goodreads cache is cleared after processing each book
         self.retriever.goodreads_cache = None
+        return saved
 
-    def process_title_author(self, title: str, authors: set[str]) -> None:
+    def process_title_author(self, title: str, authors: set[str]) -> bool:
         """
         Process a book by title and author(s).
 
         Args:
             title: The book title.
             authors: A tuple of author names.
+
+        Returns:
+            True if the book was saved.
         """
         authors_str: str = ", ".join(authors)
-        logger.debug(f"Fetching data for title: {title!r}, author(s): {authors_str!r}")
+        logger.debug("Fetching data for title: %r, author(s): %r", title, authors_str)
         book_data: dict[str, Any] | None = self.retriever.fetch_by_title_author(
             title, authors
         )
-        self.process_book_data(book_data, f"{title!r} by {authors_str!r}")
-
-    def process_file(self, file_path: str, process_func: Callable[[str], None]) -> None:
+        return self.process_book_data(book_data, f"{title!r} by {authors_str!r}")
+
+    def process_file(
+        self,
+        file_path: str,
+        process_func: Callable[[str], bool],
+        workers: int = 1,
+        resume: bool = False,
+    ) -> None:
         """
         Process a file containing ISBNs or Goodreads URLs.
 
+        Every processed line is recorded in a checkpoint journal for the file.
+        ISBN files are read in chunks that are resolved in batch lookups
+        before their lines are processed.
+
         Args:
             file_path: Path to the file to process.
-            process_func: Function to process each line of the file.
+            process_func: Function to process each line of the file, returning
+                whether a book was saved.
+            workers: Number of lines processed concurrently.
+            resume: Skip items completed by a previous run of the same file.
+        """
+        with open(file_path, "r") as file:
+            items: Iterator[tuple[int, str, str]] = (
+                (line_number, item, item)
+                for line_number, item in enumerate(map(str.strip, file), 1)
+            )
+            self._process_items(
+                file_path,
+                items,
+                process_func,
+                workers=workers,
+                resume=resume,
+                prefetch=(
+                    self._prefetch_isbns if process_func == self.process_isbn else None
+                ),
+            )
+
+    def process_goodreads_export(
+        self, file_path: str, workers: int = 1, resume: bool = False
+    ) -> None:
+        """
+        Process a Goodreads library export CSV.
+
+        Rows are streamed from the file and resolved like an ISBN file, with
+        the export's fields seeding the aggregation. Every processed row is
+        recorded in a checkpoint journal for the file.
+
+        Args:
+            file_path: Path to the export CSV.
+            workers: Number of books processed concurrently.
+            resume: Skip books completed by a previous run of the same file.
+        """
+        items: Iterator[tuple[int, str, dict[str, Any]]] = (
+            (
+                row_number,
+                book_data.get("isbn") or book_data.get("link") or book_data["title"],
+                book_data,
+            )
+            for row_number, book_data in read_goodreads_export(file_path)
+        )
+        self._process_items(
+            file_path,
+            items,
+            self.process_goodreads_book,
+            workers=workers,
+            resume=resume,
+            prefetch=lambda books: self._prefetch_isbns(
+                [book["isbn"] for book in books if book.get("isbn")]
+            ),
+        )
+
+    def process_goodreads_book(self, book_data: dict[str, Any]) -> bool:
+        """
+        Process a book read from a Goodreads library export.
+
+        Args:
+            book_data: Compiled data of the book from the export.
+
+        Returns:
+            True if the book was saved or had been fetched before.
+        """
+        isbn: str | None = book_data.get("isbn")
+        if isbn and self.isbn_index is not None and self.isbn_index.contains(isbn):
+            logger.info("ISBN %s was already fetched. Skipping.", isbn)
+            return True
+
+        logger.debug("Fetching data for Goodreads export book: %r", book_data["title"])
+        result: dict[str, Any] | None = self.retriever.fetch_by_goodreads_export(
+            book_data
+        )
+        search_term: str = f"Goodreads export book {book_data['title']!r}"
+        if not self.process_book_data(result, search_term):
+            return False
+        if isbn and self.isbn_index is not None:
+            self.isbn_index.add(isbn)
+        return True
+
+    def _process_items(
+        self,
+        file_path: str,
+        items: Iterator[tuple[int, str, T]],
+        process_func: Callable[[T], bool],
+        workers: int,
+        resume: bool,
+        prefetch: Callable[[list[T]], list[str]] | None = None,
+    ) -> None:
+        """
+        Process the items of an input file concurrently.
+
+        Args:
+            file_path: Path to the input file, naming its checkpoint journal.
+            items: Position in the file, journal key and value of every item.
+            process_func: Function to process each item value, returning
+                whether a book was saved. Items without a saved book are
+                journaled as OUTCOME_NO_DATA and retried on resume.
+            workers: Number of items processed concurrently.
+            resume: Skip items completed by a previous run of the same file.
+            prefetch: Function resolving a chunk of item values in batch
+                and returning the prefetched ISBNs, whose unused results are
+                dropped once the chunk is done.
         """
         error_log = Path("error_log.txt")
-        with open(file_path, "r") as file, open(error_log, "a") as log:
-            for line_number, line in enumerate(file, 1):
-                item: str = line.strip()
-                try:
-                    process_func(item)
-                except Exception as e:
+        log_lock = threading.Lock()
+        processed_items = 0
+        failed_items = 0
+        no_data_items = 0
+        skipped_items = 0
+        start_time: float = time.perf_counter()
+
+        journal = CheckpointJournal(file_path)
+        completed_items: set[str] = journal.completed_items() if resume else set()
+        if resume:
+            logger.info(
+                f"Resuming {file_path}: {len(completed_items)} items already done"
+            )
+
+        def run(line_number: int, item: str, value: T, log: TextIO) -> str:
+            try:
+                outcome: str = OUTCOME_DONE if process_func(value) else OUTCOME_NO_DATA
+            except Exception as e:
+                with log_lock:
                     self._log_error(e, line_number, item, log)
-
+                outcome = OUTCOME_ERROR
+            finally:
+                # Ensure Goodreads cache is cleared after processing each book
+                self.retriever.goodreads_cache = None
+            journal.record(line_number, item, outcome)
+            return outcome
+
+        def count(outcome: str) -> None:
+            nonlocal processed_items, failed_items, no_data_items
+            processed_items += 1
+            failed_items += outcome == OUTCOME_ERROR
+            no_data_items += outcome == OUTCOME_NO_DATA
+
+        with (
+            open(error_log, "a") as log,
+            ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="book-worker"
+            ) as executor,
+        ):
+            in_flight: set[Future] = set()
+            # Books and prefetched ISBNs of every chunk not yet released
+            prefetched_chunks: list[tuple[list[Future], list[str]]] = []
+            last_flush: float = time.perf_counter()
+            while chunk := list(islice(items, PREFETCH_CHUNK_SIZE)):
+                # Save progress regularly, so a crash does not lose it
+                if (
+                    self.isbn_index is not None
+                    and time.perf_counter() - last_flush >= ISBN_INDEX_FLUSH_INTERVAL
+                ):
+                    self.isbn_index.flush()
+                    last_flush = time.perf_counter()
+
+                pending: list[tuple[int, str, T]] = []
+                for line_number, item, value in chunk:
+                    if item in completed_items:
+                        skipped_items += 1
+                    else:
+                        pending.append((line_number, item, value))
+
+                prefetched: list[str] = (
+                    prefetch([value for _, _, value in pending])
+                    if prefetch is not None
+                    else []
+                )
+
+                chunk_futures: list[Future] = []
+                for line_number, item, value in pending:
+                    # Keep at most `workers` books in flight
+                    if len(in_flight) >= workers:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            count(future.result())
+                    future = executor.submit(run, line_number, item, value, log)
+                    in_flight.add(future)
+                    chunk_futures.append(future)
+
+                if prefetched:
+                    prefetched_chunks.append((chunk_futures, prefetched))
+                prefetched_chunks = self._release_prefetched(prefetched_chunks)
+
+            for future in in_flight:
+                count(future.result())
+            self._release_prefetched(prefetched_chunks)
+
+        journal.close()
+        if self.isbn_index is not None:
+            self.isbn_index.flush()
+        elapsed: float = time.perf_counter() - start_time
         logger.info(f"Finished processing file: {file_path}")
+        logger.info(
+            f"Processed {processed_items} items ({failed_items} failed, "
+            f"{no_data_items} without data) "
+            f"in {elapsed:.1f}s with {workers} worker(s): "
+            f"{processed_items / elapsed if elapsed else 0:.2f} items/s"
+        )
+        if skipped_items:
+            logger.info(f"Skipped {skipped_items} items completed by a previous run")
 
-        # Ensure Goodreads cache is cleared after processing each book
-        self.retriever.goodreads_cache = None
+    def _prefetch_isbns(self, isbns: list[str]) -> list[str]:
+        """
+        Resolve a chunk of ISBNs in batch, skipping already fetched ones.
+
+        Args:
+            isbns: ISBNs read from the input file.
+
+        Returns:
+            The ISBNs that were prefetched.
+        """
+        to_fetch: list[str] = [
+            isbn
+            for isbn in isbns
+            if isbn and (self.isbn_index is None or not self.isbn_index.contains(isbn))
+        ]
+        if not to_fetch:
+            return []
+        try:
+            self.retriever.prefetch_isbns(to_fetch)
+        except Exception as e:
+            # Books are still fetched one by one if the batch lookup fails
+            logger.warning(f"Batch lookup of {len(to_fetch)} ISBNs failed: {str(e)}")
+            return []
+        return to_fetch
+
+    def _release_prefetched(
+        self, chunks: list[tuple[list[Future], list[str]]]
+    ) -> list[tuple[list[Future], list[str]]]:
+        """
+        Drop the unused batch results of chunks whose books are all done.
+
+        Returns:
+            The chunks with books still in flight.
+        """
+        remaining: list[tuple[list[Future], list[str]]] = []
+        for futures, isbns in chunks:
+            if all(future.done() for future in futures):
+                self.retriever.discard_prefetched(isbns)
+            else:
+                remaining.append((futures, isbns))
+        return remaining
 
     def _log_error(
-        self, e: Exception, line_number: int, item: str, log_file: Any
+        self, e: Exception, line_number: int, item: str, log_file: TextIO
     ) -> None:
         """
         Log an error that occurred during file processing.
@@ -177,4 +491,6 @@ class BookProcessor:
         logger.error(
             f"Error processing item at line {line_number}: {item}. Error: {str(e)}"
         )
-        logger.debug(f"Detailed error for item at line {line_number}:\n{error_message}")
+        logger.debug(
+            "Detailed error for item at line %d:\n%s", line_number, error_message
+        )
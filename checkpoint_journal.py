@@ -0,0 +1,87 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import TextIO
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = Path("data/checkpoints")
+
+OUTCOME_DONE = "done"
+OUTCOME_NO_DATA = "no_data"
+OUTCOME_ERROR = "error"
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of the items processed from an input file.
+
+    Each processed line is recorded as one JSON line with its line number, item
+    and outcome, so an interrupted run can be resumed without re-fetching the
+    items that were already completed. Items that failed or for which no book
+    was saved are retried.
+    """
+
+    def __init__(self, input_file: str, checkpoint_dir: Path = CHECKPOINT_DIR) -> None:
+        """
+        Open the journal of an input file for appending.
+
+        Args:
+            input_file: Path to the input file being processed.
+            checkpoint_dir: Directory where journals are kept.
+        """
+        input_path: Path = Path(input_file).resolve()
+        path_hash: str = hashlib.sha1(str(input_path).encode()).hexdigest()[:8]
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self.path: Path = checkpoint_dir / f"{input_path.stem}_{path_hash}.jsonl"
+        self._lock = threading.Lock()
+        self._file: TextIO = open(self.path, "a", encoding="utf-8")
+
+    def completed_items(self) -> set[str]:
+        """
+        Get the items recorded as completed by previous runs.
+
+        Returns:
+            set[str]: Items whose last recorded outcome is "done".
+        """
+        completed: set[str] = set()
+        with self._lock:
+            self._file.flush()
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A partially written last line from an interrupted run
+                        continue
+                    if entry["outcome"] == OUTCOME_DONE:
+                        completed.add(entry["item"])
+                    else:
+                        completed.discard(entry["item"])
+        logger.debug(f"Found {len(completed)} completed items in {self.path}")
+        return completed
+
+    def record(self, line_number: int, item: str, outcome: str) -> None:
+        """
+        Append the outcome of an item to the journal.
+
+        Args:
+            line_number: Line number of the item in the input file.
+            item: The processed item.
+            outcome: OUTCOME_DONE, OUTCOME_NO_DATA or OUTCOME_ERROR.
+        """
+        entry: str = json.dumps(
+            {"line": line_number, "item": item, "outcome": outcome, "at": time.time()},
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._file.write(entry + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the journal file."""
+        with self._lock:
+            self._file.close()
@@ -1,12 +1,31 @@
 import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-environment: str | None = os.getenv("ENVIRONMENT")
-if environment == "TESTING":
-    NOTION_DATABASE_ID: str = os.environ["TESTING_DATABASE_ID"]
-elif environment == "STAGING":
-    NOTION_DATABASE_ID: str = os.environ["STAGING_DATABASE_ID"]
-else:
-    raise ValueError("Invalid environment setting. Must be 'TESTING' or 'STAGING'.")
+from functools import cache
+from typing import Any
+
+
+@cache
+def load_environment() -> None:
+    """Load environment variables from the .env file, once per process."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@cache
+def _notion_database_id() -> str:
+    load_environment()
+    environment: str | None = os.getenv("ENVIRONMENT")
+    if environment == "TESTING":
+        return os.environ["TESTING_DATABASE_ID"]
+    elif environment == "STAGING":
+        return os.environ["STAGING_DATABASE_ID"]
+    else:
+        raise ValueError("Invalid environment setting. Must be 'TESTING' or 'STAGING'.")
+
+
+def __getattr__(name: str) -> Any:
+    # Settings are read from the environment on first use rather than on
+    # import, so commands that never talk to Notion do not need them
+    if name == "NOTION_DATABASE_ID":
+        return _notion_database_id()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
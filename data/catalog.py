@@ -0,0 +1,249 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+from golden_book_retriever.utils.isbn_utils import isbn_key
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = "data/catalog.sqlite3"
+
+
+def normalize_text(value: str) -> str:
+    """
+    Normalize a title or author for lookups, ignoring case and extra whitespace.
+    """
+    return " ".join(value.split()).casefold()
+
+
+def _catalog_isbn(isbn: str | None) -> str | None:
+    return isbn_key(isbn) if isbn else None
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, set):
+        return sorted(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class BookCatalog:
+    """
+    SQLite-backed catalog of processed books.
+
+    Each book is stored as one row keyed by the name its JSON file would have
+    under data/books. The row holds the book data as a JSON payload along
+    with indexed columns for the normalized ISBN, title and first author and
+    the time the book was fetched, so lookups and incremental selections do
+    not have to scan and parse every book.
+    """
+
+    def __init__(self, path: str = DEFAULT_CATALOG_PATH) -> None:
+        """
+        Open or create the catalog.
+
+        Args:
+            path: Path to the SQLite database file.
+        """
+        self.path: Path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS books (
+                key TEXT PRIMARY KEY,
+                isbn TEXT,
+                title TEXT NOT NULL,
+                author TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                payload TEXT NOT NULL,
+                payload_hash TEXT NOT NULL,
+                uploaded_hash TEXT,
+                page_id TEXT
+            );
+            CREATE INDEX IF NOT EXISTS books_isbn ON books (isbn);
+            CREATE INDEX IF NOT EXISTS books_title_author ON books (title, author);
+            CREATE INDEX IF NOT EXISTS books_fetched_at ON books (fetched_at);
+            """
+        )
+        self._conn.commit()
+
+    def put(
+        self, key: str, book_data: dict[str, Any], fetched_at: float | None = None
+    ) -> None:
+        """
+        Insert or replace a book.
+
+        Args:
+            key: Name of the book, as generated by BookProcessor.generate_filename.
+            book_data: The processed book data.
+            fetched_at: When the book was fetched. Defaults to now.
+        """
+        payload: str = json.dumps(book_data, ensure_ascii=False, default=_json_default)
+        authors: list[str] = sorted(book_data.get("authors") or [])
+        row = (
+            key,
+            _catalog_isbn(book_data.get("isbn")),
+            normalize_text(book_data.get("title") or ""),
+            normalize_text(authors[0]) if authors else "",
+            fetched_at if fetched_at is not None else time.time(),
+            payload,
+            hashlib.sha256(payload.encode("utf-8")).hexdigest(),
+        )
+        with self._lock:
+            # Keep the upload state so an unchanged payload is not uploaded again
+            self._conn.execute(
+                "INSERT INTO books "
+                "(key, isbn, title, author, fetched_at, payload, payload_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET isbn = excluded.isbn, "
+                "title = excluded.title, author = excluded.author, "
+                "fetched_at = excluded.fetched_at, payload = excluded.payload, "
+                "payload_hash = excluded.payload_hash",
+                row,
+            )
+            self._conn.commit()
+
+    def _select(self, where: str, params: tuple[Any, ...] = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT key, payload, payload_hash FROM books {where}", params
+            ).fetchall()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get a book by its key, or None if it is not in the catalog."""
+        rows = self._select("WHERE key = ?", (key,))
+        return json.loads(rows[0][1]) if rows else None
+
+    def find_by_isbn(self, isbn: str) -> list[dict[str, Any]]:
+        """Get the books with an ISBN, matching ISBN-10 and ISBN-13 forms."""
+        rows = self._select("WHERE isbn = ?", (_catalog_isbn(isbn),))
+        return [json.loads(payload) for _, payload, _ in rows]
+
+    def find_by_title_author(self, title: str, author: str) -> list[dict[str, Any]]:
+        """Get the books with a title whose first author matches."""
+        rows = self._select(
+            "WHERE title = ? AND author = ?",
+            (normalize_text(title), normalize_text(author)),
+        )
+        return [json.loads(payload) for _, payload, _ in rows]
+
+    def contains_isbn(self, isbn: str) -> bool:
+        """Check whether a book with this ISBN is in the catalog."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM books WHERE isbn = ? LIMIT 1", (_catalog_isbn(isbn),)
+            ).fetchone()
+        return row is not None
+
+    def isbns(self) -> list[str]:
+        """Get the normalized ISBNs of the books in the catalog."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT isbn FROM books WHERE isbn IS NOT NULL"
+            ).fetchall()
+        return [isbn for (isbn,) in rows]
+
+    def count(self) -> int:
+        """Get the number of books in the catalog."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    def books(
+        self, since: float | None = None
+    ) -> Iterator[tuple[str, dict[str, Any], str]]:
+        """
+        Iterate over the books in the order they were fetched.
+
+        Args:
+            since: Only include books fetched at or after this Unix timestamp.
+
+        Yields:
+            The key, book data and payload hash of each book.
+        """
+        if since is None:
+            rows = self._select("ORDER BY fetched_at")
+        else:
+            rows = self._select("WHERE fetched_at >= ? ORDER BY fetched_at", (since,))
+        for key, payload, payload_hash in rows:
+            yield key, json.loads(payload), payload_hash
+
+    def pending_uploads(self) -> Iterator[tuple[str, dict[str, Any], str]]:
+        """Iterate over the books not uploaded since their payload last changed."""
+        rows = self._select(
+            "WHERE uploaded_hash IS NULL OR uploaded_hash != payload_hash "
+            "ORDER BY fetched_at"
+        )
+        for key, payload, payload_hash in rows:
+            yield key, json.loads(payload), payload_hash
+
+    def mark_uploaded(self, key: str, payload_hash: str, page_id: str | None) -> None:
+        """
+        Record that a book was synced to Notion.
+
+        Args:
+            key: Key of the synced book.
+            payload_hash: Hash of the payload that was synced.
+            page_id: ID of the created Notion page, or None if it already existed.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE books SET uploaded_hash = ?, page_id = ? WHERE key = ?",
+                (payload_hash, page_id, key),
+            )
+            self._conn.commit()
+
+    def import_directory(self, books_dir: str) -> int:
+        """
+        Import the book JSON files of a directory.
+
+        The file modification time is used as the fetch time.
+
+        Args:
+            books_dir: Directory containing book JSON files.
+
+        Returns:
+            The number of imported books.
+        """
+        imported = 0
+        for book_file in Path(books_dir).glob("*.json"):
+            try:
+                with open(book_file, "r", encoding="utf-8") as f:
+                    book_data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Could not read {book_file}: {str(e)}")
+                continue
+            self.put(book_file.stem, book_data, fetched_at=book_file.stat().st_mtime)
+            imported += 1
+        logger.info(f"Imported {imported} books from {books_dir} into {self.path}")
+        return imported
+
+    def export_directory(self, output_dir: str) -> int:
+        """
+        Write every book out as a JSON file, in the data/books layout.
+
+        Args:
+            output_dir: Directory to export to.
+
+        Returns:
+            The number of exported books.
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        exported = 0
+        for key, book_data, _ in self.books():
+            with open(output_path / f"{key}.json", "w", encoding="utf-8") as f:
+                json.dump(book_data, f, ensure_ascii=False, indent=2)
+            exported += 1
+        logger.info(f"Exported {exported} books from {self.path} to {output_dir}")
+        return exported
+
+    def close(self) -> None:
+        """Close the catalog database."""
+        with self._lock:
+            self._conn.close()
@@ -1,14 +1,12 @@
 import sys
 import logging
-import importlib
 from functools import wraps
 import traceback
 from types import ModuleType, FunctionType, MethodType
-from importlib.abc import Loader, MetaPathFinder
 from importlib.machinery import ModuleSpec
-from typing import Sequence
+from typing import Any, Sequence
 
-print("Error handler module loaded successfully!")
+logger: logging.Logger = logging.getLogger(__name__)
 
 
 def setup_logging() -> None:
@@ -42,9 +40,19 @@ def global_exception_handler(exc_type, exc_value, exc_traceback) -> None:
     logging.error(f"Uncaught exception:\n{full_traceback}")
 
 
-class ErrorHandlerFinder(MetaPathFinder):
+# The finder and loader implement the import protocols without subclassing
+# importlib.abc, whose import loads importlib.resources on every startup
+class ErrorHandlerFinder:
+    """
+    Wraps the functions of the named modules with exception_handler.
+
+    The module is located by the remaining finders and loaded by its own
+    loader; the functions are wrapped in place once it has executed, so the
+    module is imported only once.
+    """
+
     def __init__(self, module_names) -> None:
-        self.module_names = module_names
+        self.module_names = frozenset(module_names)
 
     def find_spec(
         self,
@@ -52,29 +60,38 @@ class ErrorHandlerFinder(MetaPathFinder):
         path: Sequence[str] | None,
         target: ModuleType | None = None,
     ) -> ModuleSpec | None:
-        if fullname in self.module_names:
-            return ModuleSpec(fullname, ErrorHandlerLoader(fullname))
+        if fullname not in self.module_names:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec: ModuleSpec | None = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None:
+                    spec.loader = ErrorHandlerLoader(spec.loader)
+                return spec
         return None
 
 
-class ErrorHandlerLoader(Loader):
-    def __init__(self, fullname: str) -> None:
-        self.fullname: str = fullname
+class ErrorHandlerLoader:
+    def __init__(self, loader: Any) -> None:
+        self.loader: Any = loader
 
     def create_module(self, spec: ModuleSpec) -> ModuleType | None:
-        return None  # Use default module creation
+        return self.loader.create_module(spec)
 
     def exec_module(self, module: ModuleType) -> None:
-        original_module: ModuleType = importlib.import_module(self.fullname)
-        for name, obj in original_module.__dict__.items():
+        self.loader.exec_module(module)
+        for name, obj in list(vars(module).items()):
+            # Module hooks such as __getattr__ raise AttributeError by design
+            if name.startswith("__"):
+                continue
             if isinstance(obj, (FunctionType, MethodType)):
                 setattr(module, name, exception_handler(obj))
-            else:
-                setattr(module, name, obj)
 
 
 def setup_error_handling(module_names) -> None:
-    print(f"Setting up error handling for modules: {module_names}")
+    logger.debug(f"Setting up error handling for modules: {module_names}")
     setup_logging()
     sys.excepthook = global_exception_handler
     sys.meta_path.insert(0, ErrorHandlerFinder(module_names))
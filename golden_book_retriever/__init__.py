@@ -1,3 +1,13 @@
-from .retriever import Retriever
+from typing import Any
 
 __all__: list[str] = ["Retriever"]
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use, so that loading a utility module does not pull in
+    # the retriever and every data source
+    if name == "Retriever":
+        from .retriever import Retriever
+
+        return Retriever
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
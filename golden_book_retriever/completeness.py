@@ -0,0 +1,87 @@
+# completeness.py
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Fields a book needs before the remaining sources are skipped
+DEFAULT_REQUIRED_FIELDS: tuple[str, ...] = (
+    "title",
+    "authors",
+    "isbn",
+    "description",
+    "cover",
+)
+
+# Sources queried first; they answer from a batch prefetch or a local index
+DEFAULT_PRIMARY_SOURCES: tuple[str, ...] = ("OpenLibraryAPI", "OpenLibraryDump")
+
+EARLY_EXIT_MODES: tuple[str, ...] = ("skip", "background")
+
+
+@dataclass(frozen=True)
+class CompletenessPolicy:
+    """
+    Decides when a book has enough data to stop querying sources.
+
+    Sources are identified by class name, e.g. "GoogleBooksAPI".
+
+    Attributes:
+        required_fields: Fields that must have a value.
+        trusted_sources: Sources whose value counts for a field, per field.
+            A field missing from the mapping is satisfied by any source.
+        primary_sources: Sources queried before the others.
+        background: Fetch the remaining sources of a complete book in the
+            background, filling the response cache and raw data store,
+            instead of skipping them.
+    """
+
+    required_fields: tuple[str, ...] = DEFAULT_REQUIRED_FIELDS
+    trusted_sources: dict[str, frozenset[str]] = field(default_factory=dict)
+    primary_sources: tuple[str, ...] = DEFAULT_PRIMARY_SOURCES
+    background: bool = False
+
+    @classmethod
+    def from_file(cls, path: str, background: bool = False) -> "CompletenessPolicy":
+        """
+        Load a policy from a JSON file.
+
+        The file may set "required_fields" and "primary_sources" to lists and
+        "trusted_sources" to an object mapping fields to lists of sources.
+        Missing keys keep their defaults.
+
+        Args:
+            path: Path to the JSON file.
+            background: Fetch skipped sources in the background.
+        """
+        with open(Path(path), "r", encoding="utf-8") as f:
+            config: dict = json.load(f)
+        return cls(
+            required_fields=tuple(
+                config.get("required_fields", DEFAULT_REQUIRED_FIELDS)
+            ),
+            trusted_sources={
+                name: frozenset(sources)
+                for name, sources in config.get("trusted_sources", {}).items()
+            },
+            primary_sources=tuple(
+                config.get("primary_sources", DEFAULT_PRIMARY_SOURCES)
+            ),
+            background=background,
+        )
+
+    def is_primary(self, source_name: str) -> bool:
+        return source_name in self.primary_sources
+
+    def is_complete(self, field_sources: dict[str, set[str]]) -> bool:
+        """
+        Check whether the sources queried so far filled every required field.
+
+        Args:
+            field_sources: Sources that returned a value, per field.
+        """
+        for name in self.required_fields:
+            sources: set[str] = field_sources.get(name, set())
+            trusted: frozenset[str] | None = self.trusted_sources.get(name)
+            if not sources or (trusted is not None and not sources & trusted):
+                return False
+        return True
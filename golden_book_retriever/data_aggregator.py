@@ -1,31 +1,86 @@
 import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 import logging
-from typing import Any
+from typing import Any, Callable
 
+from golden_book_retriever.utils.log_utils import Payload
+from golden_book_retriever.utils.metrics import get_metrics
+from golden_book_retriever.utils.miss_registry import MissRegistry
+from golden_book_retriever.utils.raw_store import RawDataStore
+from golden_book_retriever.utils.response_cache import ResponseCache
 from golden_book_retriever.utils.string_utils import normalize_tags
+from .completeness import CompletenessPolicy
 from .sources.goodreads import GoodreadsScraper
 from .sources.openlibrary import OpenLibraryAPI
+from .sources.openlibrary_dump import OpenLibraryDump
 from .sources.googlebooks import GoogleBooksAPI
 from .interface.data_source import DataSourceInterface
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+# Background fetches of a background completeness policy run on their own
+# workers, so they never hold up the books being aggregated
+BACKGROUND_WORKERS = 2
+# Background fetches waiting for a worker; further ones are dropped
+BACKGROUND_QUEUE_LIMIT = 100
+
 
 class DataAggregator:
     """
     Aggregates book data from multiple sources.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        concurrent_books: int = 1,
+        cache: ResponseCache | None = None,
+        raw_store: RawDataStore | None = None,
+        openlibrary_dump: OpenLibraryDump | None = None,
+        completeness_policy: CompletenessPolicy | None = None,
+        miss_registry: MissRegistry | None = None,
+    ) -> None:
         """
         Initialize the DataAggregator with data sources.
+
+        Args:
+            concurrent_books: Number of books that may be aggregated at the same
+                time. The source worker pool gets one worker per source per book.
+            cache: Persistent cache for source responses, or None to disable it.
+            raw_store: Compressed store for raw responses. If None, raw data is
+                written as one JSON file per source under data/books/raw_data.
+            openlibrary_dump: Local OpenLibrary dump index used instead of the
+                OpenLibrary API, or None to query openlibrary.org.
+            completeness_policy: Policy to query the primary sources first and
+                skip the others for books they complete, or None to always
+                query every source.
+            miss_registry: Registry of ISBNs sources returned no book for,
+                which are not looked up again until their entry expires, or
+                None to always query every source.
         """
         self.sources: tuple[DataSourceInterface, ...] = (
             GoodreadsScraper(),
             GoogleBooksAPI(),
-            OpenLibraryAPI(),
+            openlibrary_dump or OpenLibraryAPI(),
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrent_books * len(self.sources),
+            thread_name_prefix="source-fetch",
+        )
+        self.cache: ResponseCache | None = cache
+        self.raw_store: RawDataStore | None = raw_store
+        self.completeness_policy: CompletenessPolicy | None = completeness_policy
+        self.miss_registry: MissRegistry | None = miss_registry
+        self.background_executor: ThreadPoolExecutor | None = None
+        self._background_slots = threading.BoundedSemaphore(
+            BACKGROUND_WORKERS + BACKGROUND_QUEUE_LIMIT
         )
+        if completeness_policy is not None and completeness_policy.background:
+            self.background_executor = ThreadPoolExecutor(
+                max_workers=BACKGROUND_WORKERS,
+                thread_name_prefix="source-background",
+            )
 
     def _check_title_match(self, title1: str, title2: str) -> bool:
         """
@@ -40,6 +95,15 @@ class DataAggregator:
     def _save_raw_data(
         self, folder_name: str, source_name: str, data: dict[str, Any] | None
     ) -> None:
+        if self.raw_store is not None:
+            try:
+                self.raw_store.put(folder_name, source_name, data)
+            except Exception as e:
+                logger.error(
+                    f"Error saving raw data for {folder_name}/{source_name}: {str(e)}"
+                )
+            return
+
         base_path: Path = Path("data/books/raw_data") / folder_name
         base_path.mkdir(parents=True, exist_ok=True)
 
@@ -51,7 +115,7 @@ class DataAggregator:
         try:
             with open(file_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
-            logger.debug(f"Raw data saved to {file_path}")
+            logger.debug("Raw data saved to %s", file_path)
         except Exception as e:
             logger.error(f"Error saving raw data to {file_path}: {str(e)}")
 
@@ -77,22 +141,233 @@ class DataAggregator:
         """
         book_data: dict[str, Any] = {}
         folder_name: str = self._generate_folder_name(isbn, title, authors)
+        policy: CompletenessPolicy | None = self.completeness_policy
+        sources: list[DataSourceInterface] = [
+            source
+            for source in reversed(self.sources)
+            if not self._is_known_miss(source, isbn, existing_goodreads_data)
+        ]
 
-        for source in reversed(self.sources):
-            fetched_data: dict[str, Any] | None = self._fetch_from_source(
-                source, isbn, title, authors, existing_goodreads_data
+        def submit(source: DataSourceInterface) -> Future:
+            return self.executor.submit(
+                self._fetch_from_source,
+                source,
+                isbn,
+                title,
+                authors,
+                existing_goodreads_data,
             )
+
+        # Query all sources concurrently, but merge in precedence order so the
+        # result is identical to a sequential run. With a completeness policy,
+        # the primary sources are queried first, and the others only if the
+        # book is still incomplete.
+        submitted: dict[DataSourceInterface, Future] = {
+            source: submit(source)
+            for source in sources
+            if self._in_first_stage(source, existing_goodreads_data)
+        }
+        remaining: list[DataSourceInterface] = [
+            source for source in sources if source not in submitted
+        ]
+        if policy is not None and remaining:
+            if policy.is_complete(self._field_sources(submitted)):
+                for source in remaining:
+                    self._skip_source(source, isbn, title, authors, folder_name)
+            else:
+                submitted.update((source, submit(source)) for source in remaining)
+
+        futures: list[tuple[DataSourceInterface, Future]] = [
+            (source, submitted[source]) for source in sources if source in submitted
+        ]
+
+        for source, future in futures:
+            fetched_data: dict[str, Any] | None = future.result()
             if fetched_data:
                 logger.debug(
-                    f"Fetched data from {fetched_data.get('source_name', 'Unknown')}: {fetched_data}"
+                    "Fetched data from %s: %s",
+                    fetched_data.get("source_name", "Unknown"),
+                    Payload(fetched_data),
                 )
                 self._process_fetched_data(book_data, fetched_data, folder_name)
             else:
-                logger.debug(f"No data fetched from {source.__class__.__name__}")
+                logger.debug("No data fetched from %s", source.__class__.__name__)
 
-        logger.debug(f"Final aggregated book_data: {book_data}")
+        logger.debug("Final aggregated book_data: %s", Payload(book_data))
         return book_data or None
 
+    def _is_known_miss(
+        self,
+        source: DataSourceInterface,
+        isbn: str | None,
+        existing_goodreads_data: dict[str, Any] | None,
+    ) -> bool:
+        """
+        Check whether a source recently had no book for the ISBN.
+
+        Known misses are left out of the book without a request.
+        """
+        if self.miss_registry is None or not isbn:
+            return False
+        if isinstance(source, GoodreadsScraper) and existing_goodreads_data:
+            return False
+        source_name: str = source.__class__.__name__
+        if not self.miss_registry.is_known_miss(source_name, isbn):
+            return False
+        logger.debug("%s has no book for ISBN %s, skipping it", source_name, isbn)
+        get_metrics().count("known_miss", source_name)
+        return True
+
+    def _record_isbn_result(
+        self,
+        source: DataSourceInterface,
+        isbn: str,
+        fetched_data: dict[str, Any] | None,
+    ) -> dict[str, Any] | None:
+        """
+        Update the miss registry with the answer of a source to an ISBN lookup.
+
+        Only answers that say there is no book count as misses; failed
+        requests return None and leave the registry unchanged.
+
+        Returns:
+            The fetched data, unchanged.
+        """
+        # Local dump lookups are cheaper than the registry itself
+        if (
+            self.miss_registry is None
+            or fetched_data is None
+            or isinstance(source, OpenLibraryDump)
+        ):
+            return fetched_data
+        source_name: str = source.__class__.__name__
+        if fetched_data.get("compiled_data"):
+            self.miss_registry.record_hit(source_name, isbn)
+        else:
+            self.miss_registry.record_miss(source_name, isbn)
+        return fetched_data
+
+    def _in_first_stage(
+        self,
+        source: DataSourceInterface,
+        existing_goodreads_data: dict[str, Any] | None,
+    ) -> bool:
+        policy: CompletenessPolicy | None = self.completeness_policy
+        if policy is None:
+            return True
+        if isinstance(source, GoodreadsScraper) and existing_goodreads_data:
+            # Goodreads data already at hand costs nothing to use
+            return True
+        return policy.is_primary(source.__class__.__name__)
+
+    def _field_sources(
+        self, submitted: dict[DataSourceInterface, Future]
+    ) -> dict[str, set[str]]:
+        """
+        Wait for the submitted sources and list the fields each one filled.
+
+        Returns:
+            The names of the sources that returned a value, per field.
+        """
+        field_sources: dict[str, set[str]] = {}
+        for source, future in submitted.items():
+            fetched_data: dict[str, Any] | None = future.result()
+            compiled_data = fetched_data.get("compiled_data") if fetched_data else None
+            if not isinstance(compiled_data, dict):
+                continue
+            for key, value in compiled_data.items():
+                if self._is_valid_value(value):
+                    field_sources.setdefault(key, set()).add(source.__class__.__name__)
+        return field_sources
+
+    def _skip_source(
+        self,
+        source: DataSourceInterface,
+        isbn: str | None,
+        title: str | None,
+        authors: set[str] | None,
+        folder_name: str,
+    ) -> None:
+        """
+        Leave a source out of a book the primary sources completed.
+
+        With a background policy, the source is still fetched so that its
+        response reaches the response cache and its raw data is saved, but
+        the book does not wait for it. Background fetches run on a small pool
+        of their own; when its queue is full, the fetch is dropped.
+        """
+        source_name: str = source.__class__.__name__
+        logger.debug("Book %s is complete, skipping %s", folder_name, source_name)
+        get_metrics().count("early_exit", source_name)
+        if self.background_executor is None:
+            return
+        if not self._background_slots.acquire(blocking=False):
+            logger.debug(
+                "Background queue is full, dropping %s for %s",
+                source_name,
+                folder_name,
+            )
+            get_metrics().count("background_dropped", source_name)
+            return
+
+        def enrich() -> None:
+            try:
+                fetched_data = self._fetch_from_source(
+                    source, isbn, title, authors, None
+                )
+                if fetched_data and fetched_data.get("raw_data"):
+                    self._save_raw_data(
+                        folder_name, source_name, fetched_data["raw_data"]
+                    )
+            except Exception as e:
+                logger.warning(
+                    f"Background fetch from {source_name} for {folder_name} "
+                    f"failed: {str(e)}"
+                )
+            finally:
+                self._background_slots.release()
+
+        self.background_executor.submit(enrich)
+
+    def prefetch_isbns(self, isbns: list[str]) -> None:
+        """
+        Resolve ISBNs in batches on sources that support batch lookups.
+
+        ISBNs with a fresh cached response or a known miss are not prefetched.
+
+        Args:
+            isbns: The ISBNs about to be fetched.
+        """
+        for source in self.sources:
+            if not isinstance(source, OpenLibraryAPI):
+                continue
+            source_name: str = source.__class__.__name__
+            missing: list[str] = [
+                isbn
+                for isbn in isbns
+                if (
+                    self.cache is None
+                    or self.cache.get(source_name, "isbn", isbn) is None
+                )
+                and (
+                    self.miss_registry is None
+                    or not self.miss_registry.is_known_miss(source_name, isbn)
+                )
+            ]
+            if missing:
+                source.prefetch_isbns(missing)
+
+    def discard_prefetched(self, isbns: list[str]) -> None:
+        """
+        Drop batch results of ISBNs whose books are done.
+
+        Args:
+            isbns: ISBNs passed to prefetch_isbns earlier.
+        """
+        for source in self.sources:
+            if isinstance(source, OpenLibraryAPI):
+                source.discard_prefetched(isbns)
+
     def _fetch_from_source(
         self,
         source: DataSourceInterface,
@@ -115,19 +390,66 @@ class DataAggregator:
             A dictionary containing the fetched data, or None if no data is found.
         """
         source_name: str = source.__class__.__name__
-        logger.debug(f"Attempting to fetch data from {source_name}")
+        logger.debug("Attempting to fetch data from %s", source_name)
 
-        if isinstance(source, GoodreadsScraper):
-            return self._fetch_from_goodreads(
-                source, isbn, title, authors, existing_goodreads_data
-            )
-        elif isbn:
-            return source.fetch_by_isbn(isbn)
-        elif title and authors:
-            return source.fetch_by_title_author(title, authors)
-        else:
-            logger.warning("Insufficient data provided for fetching")
-            return None
+        with get_metrics().timed("fetch", source_name):
+            if isinstance(source, GoodreadsScraper):
+                return self._fetch_from_goodreads(
+                    source, isbn, title, authors, existing_goodreads_data
+                )
+            elif isbn:
+                return self._cached_fetch(
+                    source,
+                    "isbn",
+                    isbn,
+                    lambda: self._record_isbn_result(
+                        source, isbn, source.fetch_by_isbn(isbn)
+                    ),
+                )
+            elif title and authors:
+                return self._cached_fetch(
+                    source,
+                    "title_author",
+                    (title, authors),
+                    lambda: source.fetch_by_title_author(title, authors),
+                )
+            else:
+                logger.warning("Insufficient data provided for fetching")
+                return None
+
+    def _cached_fetch(
+        self,
+        source: DataSourceInterface,
+        kind: str,
+        query: Any,
+        fetch: Callable[[], dict[str, Any] | None],
+    ) -> dict[str, Any] | None:
+        """
+        Fetch data from a source, going through the response cache if enabled.
+
+        Args:
+            source: The data source to fetch from.
+            kind: Lookup kind used in the cache key ("isbn", "title_author", "url").
+            query: The lookup query used in the cache key.
+            fetch: Callable performing the actual lookup.
+
+        Returns:
+            The cached or freshly fetched data, or None if no data is found.
+        """
+        # Local dump lookups are cheaper than the cache itself
+        if self.cache is None or isinstance(source, OpenLibraryDump):
+            return fetch()
+
+        source_name: str = source.__class__.__name__
+        cached: dict[str, Any] | None = self.cache.get(source_name, kind, query)
+        if cached is not None:
+            return cached
+
+        fetched_data: dict[str, Any] | None = fetch()
+        # Failed requests return None and are not cached
+        if fetched_data is not None:
+            self.cache.set(source_name, kind, query, fetched_data)
+        return fetched_data
 
     def _fetch_from_goodreads(
         self,
@@ -145,9 +467,21 @@ class DataAggregator:
                 "raw_data": None,  # We don't need to save raw data for cached results
             }
         elif isbn:
-            return source.fetch_by_isbn(isbn)
+            return self._cached_fetch(
+                source,
+                "isbn",
+                isbn,
+                lambda: self._record_isbn_result(
+                    source, isbn, source.fetch_by_isbn(isbn)
+                ),
+            )
         elif title and authors:
-            return source.fetch_by_title_author(title, authors)
+            return self._cached_fetch(
+                source,
+                "title_author",
+                (title, authors),
+                lambda: source.fetch_by_title_author(title, authors),
+            )
         return None
 
     def _process_fetched_data(
@@ -157,19 +491,21 @@ class DataAggregator:
         folder_name: str,
     ) -> None:
         source_name: str = fetched_data.get("source_name", "Unknown")
-        logger.debug(f"Processing fetched data from {source_name}")
+        logger.debug("Processing fetched data from %s", source_name)
 
         compiled_data = fetched_data.get("compiled_data")
         if compiled_data:
-            self._merge_data(book_data, compiled_data)
+            with get_metrics().timed("merge", source_name):
+                self._merge_data(book_data, compiled_data)
         else:
-            logger.debug(f"No compiled data found from {source_name}")
+            logger.debug("No compiled data found from %s", source_name)
 
         raw_data = fetched_data.get("raw_data")
         if raw_data:
-            self._save_raw_data(folder_name, source_name, raw_data)
+            with get_metrics().timed("raw_save", source_name):
+                self._save_raw_data(folder_name, source_name, raw_data)
         else:
-            logger.debug(f"No raw data found from {source_name}")
+            logger.debug("No raw data found from %s", source_name)
 
     def _merge_data(self, target: dict[str, Any], source: dict[str, Any]) -> None:
         if not isinstance(source, dict):
@@ -223,14 +559,3 @@ class DataAggregator:
                 return safe_title
         else:
             return "unknown_book"
-
-    def _is_data_complete(self, data: dict[str, Any]) -> bool:
-        # Implement your completeness check logic here
-        required_fields: list[str] = [
-            "title",
-            "authors",
-            "isbn",
-            "description",
-            "cover",
-        ]
-        return all(field in data and data[field] for field in required_fields)
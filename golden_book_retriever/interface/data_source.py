@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+import requests
+
+from golden_book_retriever.utils.http_session import get_session
 from golden_book_retriever.utils.raw_data_handler import save_raw_data
 
 
@@ -20,3 +23,7 @@ class DataSourceInterface(ABC):
     def save_raw_data(self, folder_name: str, data: dict[str, Any] | None) -> None:
         """Save raw data from the source."""
         save_raw_data(folder_name, self.__class__.__name__, data)
+
+    def http_get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request through the shared pooled session."""
+        return get_session().get(url, **kwargs)
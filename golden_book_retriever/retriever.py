@@ -1,6 +1,15 @@
+import threading
 from typing import Any
+from .completeness import CompletenessPolicy
 from .data_aggregator import DataAggregator
 from .sources.goodreads import GoodreadsScraper
+from .sources.goodreads.export import SCRAPED_FIELDS
+from .sources.openlibrary_dump import OpenLibraryDump
+from .utils.log_utils import Payload
+from .utils.metrics import get_metrics
+from .utils.miss_registry import MissRegistry
+from .utils.raw_store import RawDataStore
+from .utils.response_cache import ResponseCache
 import logging
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -11,13 +20,49 @@ class Retriever:
     A class to retrieve book data from various sources.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        workers: int = 1,
+        cache: ResponseCache | None = None,
+        raw_store: RawDataStore | None = None,
+        openlibrary_dump: OpenLibraryDump | None = None,
+        completeness_policy: CompletenessPolicy | None = None,
+        miss_registry: MissRegistry | None = None,
+    ) -> None:
         """
         Initialize the Retriever with a DataAggregator and GoodreadsScraper.
+
+        Args:
+            workers: Number of books that may be fetched concurrently.
+            cache: Persistent cache for source responses, or None to disable it.
+            raw_store: Compressed store for raw responses, or None to write
+                one JSON file per source.
+            openlibrary_dump: Local OpenLibrary dump index used instead of the
+                OpenLibrary API.
+            completeness_policy: Policy to skip the remaining sources of books
+                the primary sources complete, or None to query every source.
+            miss_registry: Registry of ISBNs sources returned no book for, or
+                None to look up every ISBN on every source.
         """
-        self.aggregator = DataAggregator()
         self.goodreads = GoodreadsScraper()
-        self.goodreads_cache: dict[str, Any] | None = None
+        self.aggregator = DataAggregator(
+            concurrent_books=workers,
+            cache=cache,
+            raw_store=raw_store,
+            openlibrary_dump=openlibrary_dump,
+            completeness_policy=completeness_policy,
+            miss_registry=miss_registry,
+        )
+        self._local = threading.local()
+
+    @property
+    def goodreads_cache(self) -> dict[str, Any] | None:
+        """Goodreads data of the book currently processed by this thread."""
+        return getattr(self._local, "goodreads_cache", None)
+
+    @goodreads_cache.setter
+    def goodreads_cache(self, value: dict[str, Any] | None) -> None:
+        self._local.goodreads_cache = value
 
     def fetch_by_isbn(self, isbn: str) -> dict[str, Any] | None:
         """
@@ -33,6 +78,24 @@ class Retriever:
             isbn=isbn, existing_goodreads_data=self.goodreads_cache
         )
 
+    def prefetch_isbns(self, isbns: list[str]) -> None:
+        """
+        Resolve a batch of ISBNs ahead of fetch_by_isbn calls for them.
+
+        Args:
+            isbns: The ISBNs about to be fetched.
+        """
+        self.aggregator.prefetch_isbns(isbns)
+
+    def discard_prefetched(self, isbns: list[str]) -> None:
+        """
+        Drop batch results that were not used once their books are done.
+
+        Args:
+            isbns: ISBNs passed to prefetch_isbns earlier.
+        """
+        self.aggregator.discard_prefetched(isbns)
+
     def fetch_by_title_author(
         self, title: str, authors: set[str]
     ) -> dict[str, Any] | None:
@@ -63,21 +126,24 @@ class Retriever:
         Returns:
             A dictionary containing the book data, or None if no data is found.
         """
-        logger.debug(f"Fetching data from Goodreads URL: {url}")
-        goodreads_data: dict[str, Any] | None = self.goodreads.fetch_by_url(url)
+        logger.debug("Fetching data from Goodreads URL: %s", url)
+        goodreads_data: dict[str, Any] | None = self.aggregator._cached_fetch(
+            self.goodreads, "url", url, lambda: self.goodreads.fetch_by_url(url)
+        )
 
         if not goodreads_data or "compiled_data" not in goodreads_data:
             logger.warning(f"No valid data found for Goodreads URL: {url}")
             return None
 
         logger.debug(
-            f"Raw Goodreads data: {goodreads_data.get('raw_data', 'No raw data')}"
+            "Raw Goodreads data: %s",
+            Payload(goodreads_data.get("raw_data", "No raw data")),
         )
 
         self.goodreads_cache = goodreads_data
 
         compiled_data = goodreads_data["compiled_data"]
-        logger.debug(f"Compiled data from Goodreads: {compiled_data}")
+        logger.debug("Compiled data from Goodreads: %s", Payload(compiled_data))
 
         # Save Goodreads raw data
         folder_name: str = self.aggregator._generate_folder_name(
@@ -89,17 +155,89 @@ class Retriever:
             folder_name, "Goodreads", goodreads_data.get("raw_data")
         )
 
+        result: dict[str, Any] | None = self._fetch_with_goodreads_data(compiled_data)
+
+        # Clear the Goodreads cache after we're done with this book
+        self.goodreads_cache = None
+
+        return result
+
+    def fetch_by_goodreads_export(
+        self, book_data: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """
+        Fetch book data for a book of a Goodreads library export.
+
+        The export's fields take the place of the Goodreads page in the
+        aggregation. The page is scraped only if the other sources leave one
+        of SCRAPED_FIELDS (description, tags, cover) empty, and then only
+        fields still missing are taken from it.
+
+        Args:
+            book_data: Compiled data of the book, as read by
+                read_goodreads_export.
+
+        Returns:
+            A dictionary containing the book data, or None if no data is found.
+        """
+        self.goodreads_cache = {"compiled_data": book_data, "raw_data": None}
+        try:
+            result: dict[str, Any] | None = self._fetch_with_goodreads_data(book_data)
+        finally:
+            self.goodreads_cache = None
+        if not result:
+            return None
+
+        missing: list[str] = [name for name in SCRAPED_FIELDS if not result.get(name)]
+        url: str | None = book_data.get("link")
+        if not missing or not url:
+            return result
+
+        logger.debug("Scraping %s for missing fields: %s", url, ", ".join(missing))
+        with get_metrics().timed("fetch", self.goodreads.__class__.__name__):
+            goodreads_data: dict[str, Any] | None = self.aggregator._cached_fetch(
+                self.goodreads, "url", url, lambda: self.goodreads.fetch_by_url(url)
+            )
+        if not goodreads_data or not goodreads_data.get("compiled_data"):
+            return result
+
+        folder_name: str = self.aggregator._generate_folder_name(
+            isbn=book_data.get("isbn"),
+            title=book_data.get("title"),
+            authors=book_data.get("authors"),
+        )
+        self.aggregator._save_raw_data(
+            folder_name, "Goodreads", goodreads_data.get("raw_data")
+        )
+        self.aggregator._merge_data(
+            result,
+            {
+                key: value
+                for key, value in goodreads_data["compiled_data"].items()
+                if not DataAggregator._is_valid_value(result.get(key))
+            },
+        )
+        return result
+
+    def _fetch_with_goodreads_data(
+        self, compiled_data: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """
+        Fetch data from all sources for a book already known from Goodreads.
+
+        The Goodreads data must be set as this thread's goodreads_cache.
+        """
         isbn = compiled_data.get("isbn")
         title = compiled_data.get("title")
         authors = compiled_data.get("authors", ())
-        logger.info(f"ISBN: {isbn}, Title: {title}, Authors: {authors}")
+        logger.info("ISBN: %s, Title: %s, Authors: %s", isbn, title, authors)
 
         result = None
         if isbn:
-            logger.debug(f"ISBN found: {isbn}. Fetching data from all sources.")
-            result: dict[str, Any] | None = self.fetch_by_isbn(isbn)
+            logger.debug("ISBN found: %s. Fetching data from all sources.", isbn)
+            result = self.fetch_by_isbn(isbn)
         elif title and authors:
-            logger.debug(f"Title and author(s) found. Fetching data from all sources.")
+            logger.debug("Title and author(s) found. Fetching data from all sources.")
             result = self.fetch_by_title_author(title, set(authors))
         else:
             logger.warning(
@@ -107,7 +245,4 @@ class Retriever:
             )
             result = compiled_data
 
-        # Clear the Goodreads cache after we're done with this book
-        self.goodreads_cache = None
-
         return result
@@ -1,5 +1,25 @@
-from .openlibrary import OpenLibraryAPI
-from .googlebooks import GoogleBooksAPI
-from .goodreads import GoodreadsScraper
+import importlib
+from typing import Any
 
-__all__: list[str] = ["OpenLibraryAPI", "GoogleBooksAPI", "GoodreadsScraper"]
+# Module defining each source, imported on first use so that a command needing
+# one source does not load the dependencies of all of them
+_SOURCE_MODULES: dict[str, str] = {
+    "OpenLibraryAPI": ".openlibrary",
+    "OpenLibraryDump": ".openlibrary_dump",
+    "GoogleBooksAPI": ".googlebooks",
+    "GoodreadsScraper": ".goodreads",
+}
+
+__all__: list[str] = [
+    "OpenLibraryAPI",
+    "OpenLibraryDump",
+    "GoogleBooksAPI",
+    "GoodreadsScraper",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module_name: str | None = _SOURCE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
@@ -1,3 +1,4 @@
 from .scraper import GoodreadsScraper
+from .export import read_goodreads_export
 
-__all__: list[str] = ["GoodreadsScraper"]
+__all__: list[str] = ["GoodreadsScraper", "read_goodreads_export"]
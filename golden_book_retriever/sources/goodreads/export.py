@@ -0,0 +1,88 @@
+# export.py
+
+import csv
+import re
+from typing import Any, Iterator
+
+BOOK_SHOW_URL: str = "https://www.goodreads.com/book/show/"
+
+# Fields a library export does not contain. A book's page is scraped only if
+# the other sources leave one of them empty.
+SCRAPED_FIELDS: tuple[str, ...] = ("description", "tags", "cover")
+
+# Spreadsheet-safe quoting used by the export for ISBNs, e.g. ="0439023483"
+_QUOTED_VALUE: re.Pattern[str] = re.compile(r'^="(.*)"$')
+# Series suffix of export titles, e.g. "Catching Fire (The Hunger Games, #2)"
+_SERIES_SUFFIX: re.Pattern[str] = re.compile(r"^(.+?)\s*\(([^()]+?),?\s+#[\d.\-]+\)$")
+
+
+def clean_export_value(value: str | None) -> str:
+    """
+    Unwrap a value of a Goodreads export cell.
+
+    ISBN columns are written as ="0439023483", or ="" when the book has none.
+    """
+    value = (value or "").strip()
+    match: re.Match[str] | None = _QUOTED_VALUE.match(value)
+    return match.group(1).strip() if match else value
+
+
+def _to_int(value: str | None) -> int | None:
+    value = clean_export_value(value)
+    return int(value) if value.isdigit() and int(value) > 0 else None
+
+
+def parse_export_row(row: dict[str, str]) -> dict[str, Any]:
+    """
+    Convert a row of a Goodreads library export to compiled book data.
+
+    Args:
+        row: Row read by csv.DictReader from the export.
+
+    Returns:
+        Compiled data with the fields of the GoodreadsScraper output that the
+        export provides. Empty fields are left out.
+    """
+    authors: set[str] = {
+        name.strip()
+        for name in [row.get("Author", "")]
+        + clean_export_value(row.get("Additional Authors")).split(",")
+        if name and name.strip()
+    }
+    title: str = clean_export_value(row.get("Title"))
+    series: str = ""
+    if match := _SERIES_SUFFIX.match(title):
+        title, series = match.group(1), match.group(2).strip()
+    book_id: str = clean_export_value(row.get("Book Id"))
+    publisher: str = clean_export_value(row.get("Publisher"))
+    result: dict[str, Any] = {
+        "title": title,
+        "authors": authors,
+        "isbn": clean_export_value(row.get("ISBN13"))
+        or clean_export_value(row.get("ISBN")),
+        "page_count": _to_int(row.get("Number of Pages")),
+        "first_publish_year": _to_int(row.get("Original Publication Year"))
+        or _to_int(row.get("Year Published")),
+        "publishers": {publisher} if publisher else set(),
+        "link": f"{BOOK_SHOW_URL}{book_id}" if book_id else "",
+        "series": series,
+    }
+    return {k: v for k, v in result.items() if v}
+
+
+def read_goodreads_export(file_path: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Stream the books of a Goodreads library export CSV.
+
+    Args:
+        file_path: Path to the export, as downloaded from Goodreads.
+
+    Yields:
+        The row number (1 for the first book) and the compiled data of each
+        book with a title.
+    """
+    with open(file_path, "r", encoding="utf-8-sig", newline="") as file:
+        for row_number, row in enumerate(csv.DictReader(file), 1):
+            book_data: dict[str, Any] = parse_export_row(row)
+            if book_data.get("title"):
+                yield row_number, book_data
@@ -2,15 +2,36 @@
 
 import logging
 import re
-from typing import Any, Dict
+from typing import Any, Dict, List
 from bs4 import BeautifulSoup
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+# Entities grouped by their apollo_state key prefix, e.g. "Book", "Contributor"
+ApolloIndex = Dict[str, List[Dict[str, Any]]]
+
+
+def build_apollo_index(apollo_state: Dict[str, Any]) -> ApolloIndex:
+    """
+    Group apollo_state entities by type in a single pass.
+
+    Keys look like "Book:kca://book/..." or "Contributor:kca://author/...";
+    everything before the first colon is used as the type. Entities keep
+    their original order within each type.
+    """
+    index: ApolloIndex = {}
+    for key, value in apollo_state.items():
+        if not isinstance(value, dict):
+            continue
+        entity_type: str = key.partition(":")[0]
+        index.setdefault(entity_type, []).append(value)
+    return index
+
 
 class BookDataExtractor:
     def __init__(self, apollo_state: Dict[str, Any]) -> None:
         self.apollo_state: Dict[str, Any] = apollo_state
+        self.index: ApolloIndex = build_apollo_index(apollo_state)
         self.combined_book_data: Dict[str, Any] = self._combine_book_data()
 
     def extract(self) -> Dict[str, Any]:
@@ -32,9 +53,8 @@ class BookDataExtractor:
 
     def _combine_book_data(self) -> Dict[str, Any]:
         combined_data: Dict[str, Any] = {}
-        for key, value in self.apollo_state.items():
-            if key.startswith("Book:"):
-                combined_data.update(value)
+        for book in self.index.get("Book", []):
+            combined_data.update(book)
         return combined_data
 
     def _extract_title(self) -> str:
@@ -75,12 +95,11 @@ class BookDataExtractor:
 
     def _extract_authors(self) -> set[str]:
         authors = set()
-        for key, value in self.apollo_state.items():
-            if key.startswith("Contributor:"):
-                author_name = value.get("name", "")
-                if author_name:
-                    authors.add(author_name)
-                    logger.debug(f"Added author: {author_name}")
+        for contributor in self.index.get("Contributor", []):
+            author_name = contributor.get("name", "")
+            if author_name:
+                authors.add(author_name)
+                logger.debug("Added author: %s", author_name)
         return authors
 
     def _extract_tags(self) -> set[str]:
@@ -103,7 +122,5 @@ class BookDataExtractor:
         return {publisher} if publisher else set()
 
     def _extract_series(self) -> str:
-        for key, value in self.apollo_state.items():
-            if key.startswith("Series:"):
-                return value.get("title", "")
-        return ""
+        series = self.index.get("Series")
+        return series[0].get("title", "") if series else ""
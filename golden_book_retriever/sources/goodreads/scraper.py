@@ -5,10 +5,15 @@ import logging
 from typing import Any
 
 from golden_book_retriever.interface.data_source import DataSourceInterface
+from golden_book_retriever.utils.log_utils import Payload
+from golden_book_retriever.utils.metrics import get_metrics
 from .extractors import BookDataExtractor
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+NEXT_DATA_MARKER: bytes = b'id="__NEXT_DATA__"'
+SCRIPT_END: bytes = b"</script>"
+
 
 class GoodreadsScraper(DataSourceInterface):
     BASE_URL: str = "https://www.goodreads.com/book/isbn/"
@@ -30,21 +35,49 @@ class GoodreadsScraper(DataSourceInterface):
             apollo_state: dict[str, Any] = self._extract_apollo_state(response)
             extractor = BookDataExtractor(apollo_state)
             book_data: dict[str, Any] = extractor.extract()
-            logger.info(f"compiled_data: {book_data}")
+            logger.debug("compiled_data: %s", Payload(book_data))
             return {"raw_data": apollo_state, "compiled_data": book_data}
         except Exception as e:
             logger.error(f"Error scraping data from {url}: {str(e)}", exc_info=True)
             return None
 
     def _fetch_page(self, url: str) -> requests.Response:
-        response: requests.Response = requests.get(url)
+        response: requests.Response = self.http_get(url)
         response.raise_for_status()
         return response
 
     def _extract_apollo_state(self, response: requests.Response) -> dict[str, Any]:
+        with get_metrics().timed("extract", self.__class__.__name__) as timer:
+            timer.add_bytes(len(response.content))
+            try:
+                json_data = self._extract_next_data_fast(response.content)
+            except ValueError as e:
+                logger.debug("Fast __NEXT_DATA__ extraction failed: %s", e)
+                json_data = self._extract_next_data_soup(response)
+            return json_data["props"]["pageProps"]["apolloState"]
+
+    @staticmethod
+    def _extract_next_data_fast(content: bytes) -> dict[str, Any]:
+        """
+        Slice the __NEXT_DATA__ payload directly out of the page bytes.
+
+        This avoids building a parse tree of the whole page.
+
+        Raises:
+            ValueError: If the script tag cannot be located or parsed.
+        """
+        marker: int = content.find(NEXT_DATA_MARKER)
+        if marker == -1:
+            raise ValueError("__NEXT_DATA__ script tag not found")
+        start: int = content.find(b">", marker) + 1
+        end: int = content.find(SCRIPT_END, start)
+        if start == 0 or end == -1:
+            raise ValueError("Unterminated __NEXT_DATA__ script tag")
+        return json.loads(content[start:end])
+
+    def _extract_next_data_soup(self, response: requests.Response) -> dict[str, Any]:
         soup = BeautifulSoup(response.text, "html.parser")
         script_tag = soup.find("script", id="__NEXT_DATA__")
         if not script_tag or not isinstance(script_tag, Tag) or not script_tag.string:
             raise ValueError("Invalid or missing script tag")
-        json_data = json.loads(script_tag.string)
-        return json_data["props"]["pageProps"]["apolloState"]
+        return json.loads(script_tag.string)
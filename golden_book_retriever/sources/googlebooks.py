@@ -6,6 +6,23 @@ from ..interface.data_source import DataSourceInterface
 
 class GoogleBooksAPI(DataSourceInterface):
     BASE_URL = "https://www.googleapis.com/books/v1/volumes"
+    # volumeInfo fields read by _parse_data; only these are requested
+    VOLUME_INFO_FIELDS: tuple[str, ...] = (
+        "title",
+        "subtitle",
+        "authors",
+        "publisher",
+        "publishedDate",
+        "description",
+        "industryIdentifiers",
+        "pageCount",
+        "categories",
+        "imageLinks/thumbnail",
+        "language",
+        "infoLink",
+    )
+    # Partial response selector built from VOLUME_INFO_FIELDS
+    FIELDS: str = f"items(volumeInfo({','.join(VOLUME_INFO_FIELDS)}))"
 
     def __init__(self) -> None:
         self.API_KEY: str | None = os.getenv("GOOGLE_BOOKS_API_KEY")
@@ -13,8 +30,13 @@ class GoogleBooksAPI(DataSourceInterface):
             raise ValueError("GOOGLE_BOOKS_API_KEY environment variable is not set")
 
     def fetch_by_isbn(self, isbn: str) -> dict[str, Any] | None:
-        params: dict[str, Any] = {"q": f"isbn:{isbn}", "key": self.API_KEY}
-        response: requests.Response = requests.get(self.BASE_URL, params=params)
+        params: dict[str, Any] = {
+            "q": f"isbn:{isbn}",
+            "key": self.API_KEY,
+            "fields": self.FIELDS,
+            "maxResults": 1,
+        }
+        response: requests.Response = self.http_get(self.BASE_URL, params=params)
         if response.status_code == 200:
             raw_data = response.json()
             compiled_data: dict[str, Any] | None = (
@@ -39,9 +61,10 @@ class GoogleBooksAPI(DataSourceInterface):
         params: dict[str, Any] = {
             "q": query,
             "key": self.API_KEY,
+            "fields": self.FIELDS,
         }
 
-        response: requests.Response = requests.get(self.BASE_URL, params=params)
+        response: requests.Response = self.http_get(self.BASE_URL, params=params)
 
         if response.status_code == 200:
             raw_data = response.json()
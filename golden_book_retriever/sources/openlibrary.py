@@ -1,14 +1,60 @@
+import logging
+import threading
 import requests
-from typing import Any
+from typing import Any, Iterable
 from ..interface.data_source import DataSourceInterface
+from ..utils.isbn_utils import isbn_key
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 
 class OpenLibraryAPI(DataSourceInterface):
     BASE_URL = "https://openlibrary.org/search.json"
+    # Number of ISBNs resolved per search request in batch lookups
+    BATCH_SIZE = 50
+    # Search doc fields read by _parse_data; only these are requested
+    FIELDS: tuple[str, ...] = (
+        "key",
+        "title",
+        "alternative_title",
+        "author_name",
+        "author_alternative_name",
+        "by_statement",
+        "description",
+        "first_sentence",
+        "first_publish_year",
+        "cover_i",
+        "number_of_pages_median",
+        "edition_count",
+        "isbn",
+        "language",
+        "publisher",
+        "subject",
+        "person",
+        "place",
+        "time",
+    )
+    # Docs inspected when matching a title and author
+    TITLE_AUTHOR_LIMIT = 20
+
+    def __init__(self) -> None:
+        # Results of batch lookups waiting to be picked up by fetch_by_isbn
+        self._prefetched: dict[str, dict[str, Any]] = {}
+        self._prefetch_lock = threading.Lock()
 
     def fetch_by_isbn(self, isbn: str) -> dict[str, Any] | None:
-        params: dict[str, str] = {"q": f"isbn:{isbn}"}
-        response: requests.Response = requests.get(self.BASE_URL, params=params)
+        with self._prefetch_lock:
+            prefetched = self._prefetched.pop(isbn_key(isbn), None)
+        if prefetched is not None:
+            logger.debug("Using prefetched OpenLibrary data for ISBN %s", isbn)
+            return prefetched
+
+        params: dict[str, Any] = {
+            "q": f"isbn:{isbn}",
+            "fields": ",".join(self.FIELDS),
+            "limit": 1,
+        }
+        response: requests.Response = self.http_get(self.BASE_URL, params=params)
         if response.status_code == 200:
             raw_data = response.json()
             compiled_data: dict[str, Any] | None = (
@@ -23,6 +69,85 @@ class OpenLibraryAPI(DataSourceInterface):
             }
         return None
 
+    def fetch_by_isbns(self, isbns: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Look up many ISBNs with one search request per BATCH_SIZE ISBNs.
+
+        Args:
+            isbns: The ISBNs to look up.
+
+        Returns:
+            A result in the fetch_by_isbn format for every ISBN whose batch
+            request succeeded, keyed by the ISBN as given.
+        """
+        isbn_list: list[str] = list(dict.fromkeys(isbns))
+        results: dict[str, dict[str, Any]] = {}
+        for start in range(0, len(isbn_list), self.BATCH_SIZE):
+            batch: list[str] = isbn_list[start : start + self.BATCH_SIZE]
+            results.update(self._fetch_isbn_batch(batch))
+        return results
+
+    def _fetch_isbn_batch(self, isbns: list[str]) -> dict[str, dict[str, Any]]:
+        wanted: dict[str, str] = {isbn_key(isbn): isbn for isbn in isbns}
+        params: dict[str, Any] = {
+            "q": f"isbn:({' OR '.join(isbns)})",
+            "fields": ",".join(self.FIELDS),
+            # Several ISBNs of a batch can belong to the same work
+            "limit": len(isbns),
+        }
+        response: requests.Response = self.http_get(self.BASE_URL, params=params)
+        if response.status_code != 200:
+            logger.warning(
+                f"OpenLibrary batch lookup of {len(isbns)} ISBNs failed "
+                f"with status {response.status_code}"
+            )
+            return {}
+
+        docs_by_isbn: dict[str, dict[str, Any]] = {}
+        for doc in response.json().get("docs", []):
+            for doc_isbn in doc.get("isbn", []):
+                normalized: str = isbn_key(doc_isbn)
+                if normalized in wanted and normalized not in docs_by_isbn:
+                    docs_by_isbn[normalized] = doc
+
+        results: dict[str, dict[str, Any]] = {}
+        for normalized, isbn in wanted.items():
+            doc = docs_by_isbn.get(normalized)
+            results[isbn] = {
+                "source_name": "OpenLibrary",
+                "raw_data": {"numFound": 1 if doc else 0, "docs": [doc] if doc else []},
+                "compiled_data": self._parse_data(doc) if doc else None,
+            }
+        logger.debug(
+            "OpenLibrary batch lookup resolved %d/%d ISBNs",
+            len(docs_by_isbn),
+            len(isbns),
+        )
+        return results
+
+    def prefetch_isbns(self, isbns: Iterable[str]) -> None:
+        """
+        Resolve ISBNs in batches ahead of time.
+
+        Subsequent fetch_by_isbn calls for these ISBNs return the prefetched
+        result instead of sending their own request.
+        """
+        results: dict[str, dict[str, Any]] = self.fetch_by_isbns(isbns)
+        with self._prefetch_lock:
+            for isbn, result in results.items():
+                self._prefetched[isbn_key(isbn)] = result
+
+    def discard_prefetched(self, isbns: Iterable[str]) -> None:
+        """
+        Drop prefetched results that were not picked up by fetch_by_isbn.
+
+        Books can finish without querying OpenLibrary, e.g. when they were
+        already fetched or another source completed them.
+        """
+        with self._prefetch_lock:
+            for isbn in isbns:
+                self._prefetched.pop(isbn_key(isbn), None)
+
     def fetch_by_title_author(
         self, title: str, authors: set[str]
     ) -> dict[str, Any] | None:
@@ -30,8 +155,12 @@ class OpenLibraryAPI(DataSourceInterface):
         author_query: str = " OR ".join(f"author:{author}" for author in authors)
         query: str = f"title:{title} AND ({author_query})"
 
-        params: dict[str, str] = {"q": query}
-        response: requests.Response = requests.get(self.BASE_URL, params=params)
+        params: dict[str, Any] = {
+            "q": query,
+            "fields": ",".join(self.FIELDS),
+            "limit": self.TITLE_AUTHOR_LIMIT,
+        }
+        response: requests.Response = self.http_get(self.BASE_URL, params=params)
 
         if response.status_code == 200:
             raw_data = response.json()
@@ -55,7 +184,8 @@ class OpenLibraryAPI(DataSourceInterface):
 
         return None
 
-    def _parse_data(self, data: dict[str, Any]) -> dict[str, Any]:
+    @staticmethod
+    def _parse_data(data: dict[str, Any]) -> dict[str, Any]:
         # Enrich description with first_sentence if available
         description = data.get("description")
         first_sentence = data.get("first_sentence")
@@ -0,0 +1,444 @@
+import gzip
+import json
+import logging
+import re
+import sqlite3
+import statistics
+import threading
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Iterable, Iterator, TextIO
+
+from data.catalog import normalize_text
+
+from ..interface.data_source import DataSourceInterface
+from ..utils.isbn_utils import isbn_key
+from .openlibrary import OpenLibraryAPI
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_DUMP_INDEX_PATH = "data/openlibrary_dump.sqlite3"
+
+# Rows buffered per table before they are written during an index build
+INSERT_BATCH_SIZE = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS authors (
+    key TEXT PRIMARY KEY,
+    name TEXT,
+    name_norm TEXT,
+    alternate_names TEXT
+);
+CREATE TABLE IF NOT EXISTS works (
+    key TEXT PRIMARY KEY,
+    title_norm TEXT,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS work_authors (
+    work_key TEXT NOT NULL,
+    author_key TEXT NOT NULL,
+    PRIMARY KEY (work_key, author_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS editions (
+    key TEXT PRIMARY KEY,
+    work_key TEXT,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS isbns (
+    isbn TEXT PRIMARY KEY,
+    edition_key TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS work_stats (
+    work_key TEXT PRIMARY KEY,
+    edition_count INTEGER,
+    first_publish_year INTEGER,
+    pages_median INTEGER
+);
+"""
+
+# Created after the bulk load, which is much faster than maintaining them
+INDEXES = """
+CREATE INDEX IF NOT EXISTS works_title ON works (title_norm);
+CREATE INDEX IF NOT EXISTS editions_work ON editions (work_key);
+"""
+
+
+def _text_value(value: Any) -> str | None:
+    """Unwrap the {"type": "/type/text", "value": ...} form used by the dumps."""
+    if isinstance(value, dict):
+        value = value.get("value")
+    return value if isinstance(value, str) and value else None
+
+
+def _year(date: Any) -> int | None:
+    match = re.search(r"\d{4}", date) if isinstance(date, str) else None
+    return int(match.group()) if match else None
+
+
+def _first_cover(record: dict[str, Any]) -> int | None:
+    # Removed covers are kept in the dumps as -1
+    covers = record.get("covers") or []
+    return next((c for c in covers if isinstance(c, int) and c > 0), None)
+
+
+def _compact(doc: dict[str, Any]) -> str:
+    return json.dumps(
+        {key: value for key, value in doc.items() if value not in (None, [])},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def _open_dump(path: str) -> TextIO:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _read_dump(path: str) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Stream the records of a dump file.
+
+    Dump lines are tab-separated: type, key, revision, last modified, JSON.
+
+    Yields:
+        The type and parsed JSON record of each line.
+    """
+    with _open_dump(path) as f:
+        for line in f:
+            columns: list[str] = line.rstrip("\n").split("\t", 4)
+            if len(columns) < 5:
+                continue
+            try:
+                yield columns[0], json.loads(columns[4])
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed record {columns[1]} in {path}")
+
+
+def _author_row(record: dict[str, Any]) -> tuple[Any, ...]:
+    name: str = record.get("name") or record.get("personal_name") or ""
+    return (
+        record["key"],
+        name,
+        normalize_text(name),
+        json.dumps(record.get("alternate_names") or [], ensure_ascii=False),
+    )
+
+
+def _work_rows(
+    record: dict[str, Any],
+) -> tuple[tuple[Any, ...], list[tuple[str, str]]]:
+    title: str = record.get("title") or ""
+    doc: dict[str, Any] = {
+        "title": title,
+        "description": _text_value(record.get("description")),
+        "first_publish_year": _year(record.get("first_publish_date")),
+        "cover": _first_cover(record),
+        "subject": record.get("subjects", []),
+        "person": record.get("subject_people", []),
+        "place": record.get("subject_places", []),
+        "time": record.get("subject_times", []),
+    }
+    authors: list[tuple[str, str]] = [
+        (record["key"], entry["author"]["key"])
+        for entry in record.get("authors", [])
+        if isinstance(entry.get("author"), dict) and "key" in entry["author"]
+    ]
+    return (record["key"], normalize_text(title), _compact(doc)), authors
+
+
+def _edition_rows(
+    record: dict[str, Any],
+) -> tuple[tuple[Any, ...], list[tuple[str, str]]]:
+    isbns: list[str] = record.get("isbn_13", []) + record.get("isbn_10", [])
+    doc: dict[str, Any] = {
+        "title": record.get("title"),
+        "isbn": isbns,
+        "by_statement": record.get("by_statement"),
+        "description": _text_value(record.get("description")),
+        "first_sentence": _text_value(record.get("first_sentence")),
+        "publish_year": _year(record.get("publish_date")),
+        "pages": record.get("number_of_pages"),
+        "cover": _first_cover(record),
+        "language": [
+            language["key"].rsplit("/", 1)[-1]
+            for language in record.get("languages", [])
+            if "key" in language
+        ],
+        "publisher": record.get("publishers", []),
+        "authors": [a["key"] for a in record.get("authors", []) if "key" in a],
+    }
+    works: list[dict[str, Any]] = record.get("works", [])
+    work_key: str | None = works[0].get("key") if works else None
+    isbn_rows: list[tuple[str, str]] = [
+        (isbn_key(isbn), record["key"]) for isbn in isbns
+    ]
+    return (record["key"], work_key, _compact(doc)), isbn_rows
+
+
+def build_dump_index(
+    dump_paths: Iterable[str], index_path: str = DEFAULT_DUMP_INDEX_PATH
+) -> None:
+    """
+    Build the lookup index from OpenLibrary data dumps.
+
+    The dumps are streamed line by line, so any mix of the authors, works,
+    editions or complete dumps can be indexed without loading them into
+    memory. Gzipped dumps are read directly.
+
+    Args:
+        dump_paths: Paths to the dump files.
+        index_path: Path to the SQLite index to create or extend.
+    """
+    Path(index_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(index_path)
+    conn.executescript(SCHEMA)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+
+    statements: dict[str, str] = {
+        "authors": "INSERT OR REPLACE INTO authors VALUES (?, ?, ?, ?)",
+        "works": "INSERT OR REPLACE INTO works VALUES (?, ?, ?)",
+        "work_authors": "INSERT OR IGNORE INTO work_authors VALUES (?, ?)",
+        "editions": "INSERT OR REPLACE INTO editions VALUES (?, ?, ?)",
+        "isbns": "INSERT OR REPLACE INTO isbns VALUES (?, ?)",
+    }
+    pending: dict[str, list[tuple[Any, ...]]] = {table: [] for table in statements}
+
+    def flush(table: str) -> None:
+        conn.executemany(statements[table], pending[table])
+        pending[table].clear()
+
+    for dump_path in dump_paths:
+        logger.info(f"Indexing OpenLibrary dump {dump_path}")
+        count = 0
+        for record_type, record in _read_dump(dump_path):
+            if record_type == "/type/author":
+                pending["authors"].append(_author_row(record))
+            elif record_type == "/type/work":
+                work_row, author_rows = _work_rows(record)
+                pending["works"].append(work_row)
+                pending["work_authors"].extend(author_rows)
+            elif record_type == "/type/edition":
+                edition_row, isbn_rows = _edition_rows(record)
+                pending["editions"].append(edition_row)
+                pending["isbns"].extend(isbn_rows)
+            else:
+                continue
+            count += 1
+            for table, rows in pending.items():
+                if len(rows) >= INSERT_BATCH_SIZE:
+                    flush(table)
+            if count % 1_000_000 == 0:
+                logger.info(f"Indexed {count} records from {dump_path}")
+        for table in statements:
+            flush(table)
+        conn.commit()
+        logger.info(f"Indexed {count} records from {dump_path}")
+
+    conn.executescript(INDEXES)
+    _build_work_stats(conn)
+    conn.commit()
+    conn.close()
+    logger.info(f"OpenLibrary dump index written to {index_path}")
+
+
+def _build_work_stats(conn: sqlite3.Connection) -> None:
+    """Aggregate the edition count, first year and median pages of each work."""
+    conn.execute("DELETE FROM work_stats")
+    rows = conn.execute(
+        "SELECT work_key, doc FROM editions WHERE work_key IS NOT NULL "
+        "ORDER BY work_key"
+    )
+    stats: list[tuple[Any, ...]] = []
+    for work_key, editions in groupby(rows, key=lambda row: row[0]):
+        years: list[int] = []
+        pages: list[int] = []
+        edition_count = 0
+        for _, doc in editions:
+            edition: dict[str, Any] = json.loads(doc)
+            edition_count += 1
+            if edition.get("publish_year"):
+                years.append(edition["publish_year"])
+            if isinstance(edition.get("pages"), int) and edition["pages"] > 0:
+                pages.append(edition["pages"])
+        stats.append(
+            (
+                work_key,
+                edition_count,
+                min(years) if years else None,
+                int(statistics.median(pages)) if pages else None,
+            )
+        )
+        if len(stats) >= INSERT_BATCH_SIZE:
+            conn.executemany("INSERT INTO work_stats VALUES (?, ?, ?, ?)", stats)
+            stats.clear()
+    conn.executemany("INSERT INTO work_stats VALUES (?, ?, ?, ?)", stats)
+
+
+class OpenLibraryDump(DataSourceInterface):
+    """
+    OpenLibrary source answering lookups from a locally built dump index.
+
+    Results have the same shape as OpenLibraryAPI results: the raw data is a
+    search response assembled from the dump records and the compiled data is
+    produced by OpenLibraryAPI._parse_data.
+    """
+
+    TITLE_AUTHOR_LIMIT = OpenLibraryAPI.TITLE_AUTHOR_LIMIT
+
+    def __init__(self, index_path: str = DEFAULT_DUMP_INDEX_PATH) -> None:
+        """
+        Open the dump index.
+
+        Args:
+            index_path: Path to an index built with build_dump_index.
+        """
+        if not Path(index_path).exists():
+            raise FileNotFoundError(f"OpenLibrary dump index not found: {index_path}")
+        self._conn = sqlite3.connect(
+            f"file:{index_path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+
+    def fetch_by_isbn(self, isbn: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT editions.key, editions.work_key, editions.doc FROM isbns "
+                "JOIN editions ON editions.key = isbns.edition_key "
+                "WHERE isbns.isbn = ?",
+                (isbn_key(isbn),),
+            ).fetchone()
+            doc: dict[str, Any] | None = (
+                self._search_doc(row[1], row[0], json.loads(row[2]), isbn)
+                if row
+                else None
+            )
+        return self._result([doc] if doc else [], doc)
+
+    def fetch_by_title_author(
+        self, title: str, authors: set[str]
+    ) -> dict[str, Any] | None:
+        author_names: set[str] = {normalize_text(author) for author in authors}
+        if not author_names:
+            # An empty IN () list is a syntax error in SQLite
+            return None
+        docs: list[dict[str, Any]] = []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT works.key FROM works "
+                "JOIN work_authors ON work_authors.work_key = works.key "
+                "JOIN authors ON authors.key = work_authors.author_key "
+                f"WHERE works.title_norm = ? AND authors.name_norm IN "
+                f"({', '.join('?' * len(author_names))}) LIMIT ?",
+                (normalize_text(title), *author_names, self.TITLE_AUTHOR_LIMIT),
+            ).fetchall()
+            for (work_key,) in rows:
+                edition = self._conn.execute(
+                    "SELECT key, doc FROM editions WHERE work_key = ? "
+                    "AND doc LIKE '%\"isbn\":%' LIMIT 1",
+                    (work_key,),
+                ).fetchone()
+                docs.append(
+                    self._search_doc(
+                        work_key,
+                        edition[0] if edition else None,
+                        json.loads(edition[1]) if edition else {},
+                    )
+                )
+
+        # Authors were already matched by the query
+        compiled_doc: dict[str, Any] | None = next(
+            (doc for doc in docs if doc.get("title")), None
+        )
+        return self._result(docs, compiled_doc)
+
+    def _result(
+        self, docs: list[dict[str, Any]], compiled_doc: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        return {
+            "source_name": "OpenLibrary",
+            "raw_data": {"numFound": len(docs), "docs": docs},
+            "compiled_data": (
+                OpenLibraryAPI._parse_data(compiled_doc) if compiled_doc else None
+            ),
+        }
+
+    def _search_doc(
+        self,
+        work_key: str | None,
+        edition_key: str | None,
+        edition: dict[str, Any],
+        isbn: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Assemble a search.json style doc from a work and one of its editions.
+
+        Must be called with the lock held.
+        """
+        work: dict[str, Any] = {}
+        stats: tuple[Any, ...] | None = None
+        author_keys: list[str] = edition.get("authors", [])
+        if work_key:
+            work_row = self._conn.execute(
+                "SELECT doc FROM works WHERE key = ?", (work_key,)
+            ).fetchone()
+            work = json.loads(work_row[0]) if work_row else {}
+            stats = self._conn.execute(
+                "SELECT edition_count, first_publish_year, pages_median "
+                "FROM work_stats WHERE work_key = ?",
+                (work_key,),
+            ).fetchone()
+            author_keys = [
+                key
+                for (key,) in self._conn.execute(
+                    "SELECT author_key FROM work_authors WHERE work_key = ?",
+                    (work_key,),
+                )
+            ] or author_keys
+
+        names: list[str] = []
+        alternative_names: list[str] = []
+        for author_key in author_keys:
+            author = self._conn.execute(
+                "SELECT name, alternate_names FROM authors WHERE key = ?",
+                (author_key,),
+            ).fetchone()
+            if author and author[0]:
+                names.append(author[0])
+                alternative_names.extend(json.loads(author[1]))
+
+        isbns: list[str] = edition.get("isbn", [])
+        if isbn:
+            # The queried ISBN comes first, as _parse_data keeps the first one
+            isbns = sorted(isbns, key=lambda i: isbn_key(i) != isbn_key(isbn))
+
+        doc: dict[str, Any] = {
+            "key": work_key or edition_key,
+            "title": work.get("title") or edition.get("title"),
+            "author_name": names,
+            "author_alternative_name": alternative_names,
+            "by_statement": edition.get("by_statement"),
+            "description": work.get("description") or edition.get("description"),
+            "first_sentence": edition.get("first_sentence"),
+            "first_publish_year": work.get("first_publish_year")
+            or (stats[1] if stats else edition.get("publish_year")),
+            "cover_i": edition.get("cover") or work.get("cover"),
+            "number_of_pages_median": (
+                stats[2] if stats and stats[2] else edition.get("pages")
+            ),
+            "edition_count": stats[0] if stats else 1,
+            "isbn": isbns,
+            "language": edition.get("language", []),
+            "publisher": edition.get("publisher", []),
+            "subject": work.get("subject", []),
+            "person": work.get("person", []),
+            "place": work.get("place", []),
+            "time": work.get("time", []),
+        }
+        return {key: value for key, value in doc.items() if value not in (None, [])}
+
+    def close(self) -> None:
+        """Close the dump index."""
+        with self._lock:
+            self._conn.close()
@@ -1,9 +1,16 @@
-from .isbn_utils import is_valid_isbn, normalize_isbn, isbn_10_to_13, isbn_13_to_10
+from .isbn_utils import (
+    is_valid_isbn,
+    isbn_key,
+    normalize_isbn,
+    isbn_10_to_13,
+    isbn_13_to_10,
+)
 from .string_utils import clean_text, normalize_author_name
 
 __all__: list[str] = [
     "is_valid_isbn",
     "normalize_isbn",
+    "isbn_key",
     "isbn_10_to_13",
     "isbn_13_to_10",
     "clean_text",
@@ -0,0 +1,130 @@
+# http_session.py
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .metrics import get_metrics
+from .rate_limiter import get_rate_limiter
+
+DEFAULT_TIMEOUT: tuple[float, float] = (5.0, 30.0)
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_RETRIES = 5
+
+# Status codes meaning the remote side wants us to slow down
+THROTTLE_STATUS_CODES: frozenset[int] = frozenset({429, 503})
+
+_session: "PooledSession | None" = None
+_session_lock = threading.Lock()
+
+
+class PooledSession(requests.Session):
+    """
+    A requests session with keep-alive connection pools and default timeouts.
+
+    Connections are pooled per host, so repeated lookups against the same
+    source reuse an open TCP/TLS connection instead of opening a new one.
+    Every request is paced by the shared per-host rate limiter, and throttled
+    requests (429/503) are retried with backoff.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> None:
+        """
+        Initialize the session.
+
+        Args:
+            pool_connections: Number of per-host connection pools to keep.
+            pool_maxsize: Maximum number of connections kept per host.
+            timeout: Default (connect, read) timeout for every request.
+            max_retries: Number of retries of a throttled request.
+        """
+        super().__init__()
+        self.timeout: float | tuple[float, float] = timeout
+        self.max_retries: int = max_retries
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+    def request(  # type: ignore[override]
+        self, method: str | bytes, url: str | bytes, *args: Any, **kwargs: Any
+    ) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        host: str = urlsplit(url if isinstance(url, str) else url.decode()).netloc
+        limiter = get_rate_limiter()
+
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire(host)
+            with get_metrics().timed("http", host) as timer:
+                response: requests.Response = super().request(
+                    method, url, *args, **kwargs
+                )
+                timer.add_bytes(len(response.content))
+                if response.status_code >= 400:
+                    timer.fail()
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                limiter.success(host)
+                return response
+            if attempt == self.max_retries:
+                break
+            delay: float | None = limiter.throttled(
+                host, attempt, response.headers.get("Retry-After")
+            )
+            if delay is None:
+                break
+            response.close()
+            time.sleep(delay)
+
+        return response
+
+
+def configure_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> PooledSession:
+    """
+    Replace the shared session with one using the given settings.
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to keep.
+        pool_maxsize (int): Maximum number of connections kept per host.
+        timeout (float | tuple[float, float]): Default request timeout.
+        max_retries (int): Number of retries of a throttled request.
+
+    Returns:
+        PooledSession: The new shared session.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = PooledSession(pool_connections, pool_maxsize, timeout, max_retries)
+        return _session
+
+
+def get_session() -> PooledSession:
+    """
+    Get the session shared by all data sources, creating it on first use.
+
+    Returns:
+        PooledSession: The shared session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = PooledSession()
+        return _session
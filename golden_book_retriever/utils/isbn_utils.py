@@ -67,6 +67,23 @@ def normalize_isbn(isbn: str) -> str:
     return isbn
 
 
+def isbn_key(isbn: str) -> str:
+    """
+    Normalize an ISBN for use as a lookup key, tolerating malformed values.
+
+    Args:
+        isbn (str): The ISBN to normalize.
+
+    Returns:
+        str: The normalized ISBN, or the stripped value if it cannot be
+            normalized, e.g. an ISBN-10 with an X before the last character.
+    """
+    try:
+        return normalize_isbn(isbn) or isbn.strip()
+    except ValueError:
+        return isbn.strip()
+
+
 def isbn_10_to_13(isbn_10: str) -> str:
     """
     Convert ISBN-10 to ISBN-13.
@@ -0,0 +1,83 @@
+# log_utils.py
+import logging
+import logging.handlers
+import queue
+import reprlib
+from typing import Any
+
+# Maximum length of a payload rendered into a log message; 0 disables the limit
+DEFAULT_PAYLOAD_LIMIT = 500
+
+_payload_limit: int = DEFAULT_PAYLOAD_LIMIT
+
+
+def configure_payload_limit(limit: int) -> None:
+    """
+    Set the maximum length of payloads rendered by `Payload`.
+
+    Args:
+        limit: Number of characters kept; 0 logs payloads in full.
+    """
+    global _payload_limit
+    _payload_limit = max(0, limit)
+
+
+class Payload:
+    """
+    Defers rendering a large value into a log message, and truncates it.
+
+    Pass it as an argument of a %-style logging call, so the value is only
+    rendered if the record is actually emitted:
+
+        logger.debug("Fetched data from %s: %s", source_name, Payload(data))
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value: Any = value
+
+    def __str__(self) -> str:
+        limit: int = _payload_limit
+        if not limit:
+            return repr(self.value)
+        # reprlib bounds the work for nested containers before truncating
+        shortener = reprlib.Repr()
+        shortener.maxstring = shortener.maxother = limit
+        shortener.maxlist = shortener.maxdict = shortener.maxset = 20
+        shortener.maxlevel = 4
+        text: str = shortener.repr(self.value)
+        if len(text) > limit:
+            return f"{text[:limit]}... [{len(text) - limit} more characters]"
+        return text
+
+    __repr__ = __str__
+
+
+def start_queue_logging(
+    handlers: list[logging.Handler],
+) -> logging.handlers.QueueListener:
+    """
+    Route the root logger through a queue to handlers run by a background thread.
+
+    Records are handed to the queue by the logging thread, and written to the
+    console or file by the listener, so a slow disk does not stall workers.
+
+    Args:
+        handlers: Handlers that write the records, with their formatters set.
+
+    Returns:
+        QueueListener: The started listener. Stop it before exiting to flush
+            the remaining records.
+    """
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    root: logging.Logger = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    listener = logging.handlers.QueueListener(
+        records, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
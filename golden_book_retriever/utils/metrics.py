@@ -0,0 +1,372 @@
+# metrics.py
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Protocol
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "bookscrapper"
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+DEFAULT_TEXTFILE_INTERVAL: float = 15.0
+
+_metrics: "Metrics | None" = None
+_metrics_lock = threading.Lock()
+
+
+@dataclass
+class StageStats:
+    """Latency histogram and counters of one (stage, source) pair."""
+
+    bucket_counts: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    calls: int = 0
+    errors: int = 0
+    bytes: int = 0
+    total_seconds: float = 0.0
+
+    def observe(self, seconds: float, error: bool, nbytes: int) -> None:
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.calls += 1
+        self.errors += error
+        self.bytes += nbytes
+        self.total_seconds += seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a latency quantile by interpolating within its bucket.
+        """
+        if not self.calls:
+            return 0.0
+        rank: float = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.bucket_counts):
+            if count and seen + count >= rank:
+                lower: float = LATENCY_BUCKETS[i - 1] if i > 0 else 0.0
+                if i == len(LATENCY_BUCKETS):
+                    # Beyond the last bucket there is no upper bound to use
+                    return lower
+                upper: float = LATENCY_BUCKETS[i]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return LATENCY_BUCKETS[-1]
+
+
+class StageTimer:
+    """Handle of an observation in progress, returned by Metrics.timed."""
+
+    def __init__(self) -> None:
+        self.error: bool = False
+        self.bytes: int = 0
+
+    def fail(self) -> None:
+        """Count the observation as an error without raising."""
+        self.error = True
+
+    def add_bytes(self, nbytes: int) -> None:
+        """Attribute transferred or processed bytes to the observation."""
+        self.bytes += nbytes
+
+
+class StageListener(Protocol):
+    """Receives a callback around every timed stage call."""
+
+    def stage_started(self, stage: str, source: str) -> None:
+        """Called before a timed stage call runs."""
+
+    def stage_finished(
+        self, stage: str, source: str, seconds: float, error: bool
+    ) -> None:
+        """Called after a timed stage call ran, whether or not it failed."""
+
+
+class Metrics:
+    """
+    Thread-safe registry of per-stage latency and request metrics.
+
+    Every observation belongs to a stage (e.g. "fetch", "extract",
+    "notion_create") and a source (e.g. "OpenLibraryAPI", a host name).
+    Each pair keeps a latency histogram and call, error and byte counters.
+    Events that take no time, e.g. a skipped source, are only counted.
+    """
+
+    def __init__(self) -> None:
+        self._stats: dict[tuple[str, str], StageStats] = {}
+        self._events: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        # Replaced rather than mutated, so timed() can read it without the lock
+        self._listeners: tuple[StageListener, ...] = ()
+        self.started_at: float = time.time()
+
+    def add_listener(self, listener: StageListener) -> None:
+        """Call a listener when each timed stage call starts and finishes."""
+        with self._lock:
+            self._listeners = (*self._listeners, listener)
+
+    def remove_listener(self, listener: StageListener) -> None:
+        """Stop calling a listener added with add_listener."""
+        with self._lock:
+            self._listeners = tuple(
+                existing for existing in self._listeners if existing is not listener
+            )
+
+    def observe(
+        self,
+        stage: str,
+        source: str,
+        seconds: float,
+        error: bool = False,
+        nbytes: int = 0,
+    ) -> None:
+        """
+        Record one completed call.
+
+        Args:
+            stage: Pipeline stage the call belongs to.
+            source: Data source, host or backend the call went to.
+            seconds: Duration of the call.
+            error: Whether the call failed.
+            nbytes: Bytes transferred or processed by the call.
+        """
+        with self._lock:
+            stats: StageStats | None = self._stats.get((stage, source))
+            if stats is None:
+                stats = self._stats[(stage, source)] = StageStats()
+            stats.observe(seconds, error, nbytes)
+
+    def count(self, event: str, source: str = "", amount: int = 1) -> None:
+        """
+        Count an event without recording a latency.
+
+        Args:
+            event: Name of the event, e.g. "early_exit".
+            source: Data source, host or backend the event concerns.
+            amount: Number of events to add.
+        """
+        with self._lock:
+            self._events[(event, source)] = (
+                self._events.get((event, source), 0) + amount
+            )
+
+    def events(self) -> dict[tuple[str, str], int]:
+        """Copy the current event counts, keyed by (event, source)."""
+        with self._lock:
+            return dict(self._events)
+
+    @contextmanager
+    def timed(self, stage: str, source: str = "") -> Iterator[StageTimer]:
+        """
+        Time the enclosed block and record it as one call.
+
+        The call counts as an error if the block raises or calls
+        `StageTimer.fail`.
+        """
+        timer = StageTimer()
+        listeners: tuple[StageListener, ...] = self._listeners
+        for listener in listeners:
+            listener.stage_started(stage, source)
+        start: float = time.perf_counter()
+        try:
+            yield timer
+        except BaseException:
+            timer.error = True
+            raise
+        finally:
+            seconds: float = time.perf_counter() - start
+            self.observe(stage, source, seconds, timer.error, timer.bytes)
+            for listener in listeners:
+                listener.stage_finished(stage, source, seconds, timer.error)
+
+    def snapshot(self) -> dict[tuple[str, str], StageStats]:
+        """Copy the current statistics, keyed by (stage, source)."""
+        with self._lock:
+            return {
+                key: StageStats(
+                    list(stats.bucket_counts),
+                    stats.calls,
+                    stats.errors,
+                    stats.bytes,
+                    stats.total_seconds,
+                )
+                for key, stats in self._stats.items()
+            }
+
+    def summary(self) -> str:
+        """
+        Render an end-of-run table with one line per stage and source.
+        """
+        snapshot = self.snapshot()
+        events = self.events()
+        if not snapshot and not events:
+            return "No metrics recorded"
+        lines: list[str] = [
+            f"{'stage':<16} {'source':<24} {'calls':>7} {'err%':>6} "
+            f"{'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'total s':>9} {'KiB':>10}"
+        ]
+        for (stage, source), stats in sorted(snapshot.items()):
+            lines.append(
+                f"{stage:<16} {source:<24} {stats.calls:>7} "
+                f"{100 * stats.errors / stats.calls:>6.1f} "
+                f"{1000 * stats.total_seconds / stats.calls:>9.1f} "
+                f"{1000 * stats.quantile(0.5):>9.1f} "
+                f"{1000 * stats.quantile(0.95):>9.1f} "
+                f"{stats.total_seconds:>9.2f} {stats.bytes / 1024:>10.1f}"
+            )
+        if events:
+            lines.append(f"{'event':<16} {'source':<24} {'count':>7}")
+            for (event, source), count in sorted(events.items()):
+                lines.append(f"{event:<16} {source:<24} {count:>7}")
+        return "\n".join(lines)
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        duration: str = f"{METRIC_PREFIX}_stage_duration_seconds"
+        lines: list[str] = [
+            f"# HELP {duration} Latency of pipeline stage calls.",
+            f"# TYPE {duration} histogram",
+        ]
+        for (stage, source), stats in sorted(snapshot.items()):
+            labels: str = _labels(stage=stage, source=source)
+            cumulative = 0
+            # The last bucket count holds calls above every bound, i.e. +Inf
+            for bound, count in zip(
+                LATENCY_BUCKETS, stats.bucket_counts[:-1], strict=True
+            ):
+                cumulative += count
+                bucket_labels: str = _labels(stage=stage, source=source, le=str(bound))
+                lines.append(f"{duration}_bucket{{{bucket_labels}}} {cumulative}")
+            lines.append(f'{duration}_bucket{{{labels},le="+Inf"}} {stats.calls}')
+            lines.append(f"{duration}_sum{{{labels}}} {stats.total_seconds}")
+            lines.append(f"{duration}_count{{{labels}}} {stats.calls}")
+
+        counters: tuple[tuple[str, str, str], ...] = (
+            ("errors_total", "errors", "Failed pipeline stage calls."),
+            ("bytes_total", "bytes", "Bytes transferred or processed per stage."),
+        )
+        for name, attribute, help_text in counters:
+            metric: str = f"{METRIC_PREFIX}_stage_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for (stage, source), stats in sorted(snapshot.items()):
+                labels = _labels(stage=stage, source=source)
+                lines.append(f"{metric}{{{labels}}} {getattr(stats, attribute)}")
+
+        events: str = f"{METRIC_PREFIX}_events_total"
+        lines.append(f"# HELP {events} Pipeline events that are counted, not timed.")
+        lines.append(f"# TYPE {events} counter")
+        for (event, source), count in sorted(self.events().items()):
+            labels = _labels(event=event, source=source)
+            lines.append(f"{events}{{{labels}}} {count}")
+
+        started: str = f"{METRIC_PREFIX}_run_start_time_seconds"
+        lines.append(f"# HELP {started} Unix time the run started.")
+        lines.append(f"# TYPE {started} gauge")
+        lines.append(f"{started} {self.started_at}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    # Label values must be double-quoted, which repr() does not guarantee
+    return ",".join(
+        name + '="' + _escape(value) + '"' for name, value in labels.items()
+    )
+
+
+class PrometheusTextfileWriter:
+    """
+    Periodically writes the metrics to a file for the node_exporter
+    textfile collector.
+
+    The file is replaced atomically, so the collector never reads a partially
+    written file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        metrics: "Metrics | None" = None,
+        interval: float = DEFAULT_TEXTFILE_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            path: Path of the .prom file to write.
+            metrics: Registry to export. Defaults to the shared one.
+            interval: Seconds between two writes.
+        """
+        self.path: Path = Path(path)
+        self.metrics: Metrics = metrics or get_metrics()
+        self.interval: float = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-textfile", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start writing in a background thread."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and write the final values."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.write()
+
+    def write(self) -> None:
+        """Write the current metrics to the file."""
+        tmp_path: Path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(self.metrics.render_prometheus(), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.path}: {str(e)}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+
+def get_metrics() -> Metrics:
+    """
+    Get the metrics registry shared by all threads, creating it on first use.
+
+    Returns:
+        Metrics: The shared registry.
+    """
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
@@ -0,0 +1,122 @@
+# miss_registry.py
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .isbn_utils import isbn_key
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DAY: int = 24 * 60 * 60
+
+DEFAULT_REGISTRY_PATH = "data/cache/known_misses.sqlite3"
+
+# Days before a source is asked again about an ISBN it had nothing for, by the
+# number of consecutive empty answers; the last step repeats
+DEFAULT_BACKOFF_DAYS: tuple[int, ...] = (1, 7, 30)
+
+
+class MissRegistry:
+    """
+    Persistent registry of ISBNs a source returned no book for.
+
+    Entries are keyed by source name and normalized ISBN. An ISBN is not
+    looked up again on that source until its entry expires; each further
+    empty answer extends the wait along the backoff schedule, and a found
+    book removes the entry.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_REGISTRY_PATH,
+        backoff_days: tuple[int, ...] = DEFAULT_BACKOFF_DAYS,
+        refresh: bool = False,
+    ) -> None:
+        """
+        Open or create the registry.
+
+        Args:
+            path: Path to the SQLite file backing the registry.
+            backoff_days: Days an entry stays valid after the first, second,
+                etc. consecutive miss.
+            refresh: If True, entries are ignored but still recorded.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.backoff_days: tuple[int, ...] = backoff_days
+        self.refresh: bool = refresh
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS misses (
+                source TEXT NOT NULL,
+                isbn TEXT NOT NULL,
+                misses INTEGER NOT NULL,
+                checked_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (source, isbn)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    def is_known_miss(self, source: str, isbn: str) -> bool:
+        """
+        Check whether a source is known to have nothing for an ISBN.
+
+        Returns:
+            True if the source returned no book for the ISBN and the entry
+            has not expired yet.
+        """
+        if self.refresh:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at FROM misses WHERE source = ? AND isbn = ?",
+                (source, isbn_key(isbn)),
+            ).fetchone()
+        return row is not None and row[0] > time.time()
+
+    def record_miss(self, source: str, isbn: str) -> None:
+        """Record that a source returned no book for an ISBN."""
+        key: str = isbn_key(isbn)
+        now: float = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT misses FROM misses WHERE source = ? AND isbn = ?",
+                (source, key),
+            ).fetchone()
+            misses: int = (row[0] if row else 0) + 1
+            days: int = self.backoff_days[min(misses, len(self.backoff_days)) - 1]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO misses "
+                "(source, isbn, misses, checked_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (source, key, misses, now, now + days * DAY),
+            )
+            self._conn.commit()
+        logger.debug(
+            "%s has no book for ISBN %s (miss %d), rechecking in %d days",
+            source,
+            key,
+            misses,
+            days,
+        )
+
+    def record_hit(self, source: str, isbn: str) -> None:
+        """Forget earlier misses once a source returned a book for an ISBN."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM misses WHERE source = ? AND isbn = ?",
+                (source, isbn_key(isbn)),
+            )
+            if cursor.rowcount:
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,244 @@
+# rate_limiter.py
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Sustained requests per second allowed for each host
+DEFAULT_RATES: dict[str, float] = {
+    "openlibrary.org": 3.0,
+    "www.googleapis.com": 5.0,
+    "www.goodreads.com": 1.0,
+    "api.notion.com": 3.0,
+}
+DEFAULT_RATE: float = 2.0
+
+BACKOFF_BASE: float = 1.0
+# Longest backoff without a Retry-After header
+BACKOFF_CAP: float = 60.0
+# Longest Retry-After a request waits for; a throttled request asked to wait
+# longer is given up instead of retried early
+MAX_RETRY_AFTER: float = 15 * 60.0
+MIN_RATE: float = 0.1
+
+_limiter: "RateLimiter | None" = None
+_limiter_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that adapts its rate to throttling responses.
+
+    The rate is halved whenever the remote side throttles us and creeps back up
+    towards the configured maximum after each successful request.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Maximum number of tokens added per second.
+            capacity: Maximum burst size. Defaults to one second worth of tokens.
+        """
+        self.max_rate: float = rate
+        self.rate: float = rate
+        self.capacity: float = capacity or max(1.0, rate)
+        self.tokens: float = self.capacity
+        self.updated_at: float = time.monotonic()
+        self.blocked_until: float = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed: float = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now: float = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait: float = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, delay: float) -> None:
+        """
+        Pause the bucket for `delay` seconds and halve its rate.
+
+        Args:
+            delay: Number of seconds no request may be sent.
+        """
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.tokens = 0
+
+    def recover(self) -> None:
+        """Move the rate back towards its maximum after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class RateLimiter:
+    """Per-host token buckets shared by every thread of the process."""
+
+    def __init__(self, rates: dict[str, float] | None = None) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            rates: Requests per second per host, overriding DEFAULT_RATES.
+        """
+        self.rates: dict[str, float] = {**DEFAULT_RATES, **(rates or {})}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        """Get the bucket for a host, creating it on first use."""
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rates.get(host, DEFAULT_RATE))
+            return self._buckets[host]
+
+    def acquire(self, host: str) -> None:
+        """Block until a request to `host` may be sent."""
+        self.bucket(host).acquire()
+
+    def success(self, host: str) -> None:
+        """Record a request to `host` that was not throttled."""
+        self.bucket(host).recover()
+
+    def throttled(
+        self, host: str, attempt: int, retry_after: str | float | None = None
+    ) -> float | None:
+        """
+        Record a throttled request and pause the host.
+
+        Args:
+            host: The host that throttled the request.
+            attempt: Zero-based number of the retry about to be made.
+            retry_after: Value of the Retry-After header, if any.
+
+        Returns:
+            float | None: Number of seconds to wait before retrying, or None
+                if the server asked for more than MAX_RETRY_AFTER seconds and
+                the request should not be retried.
+        """
+        delay: float = backoff_delay(attempt, retry_after)
+        if delay > MAX_RETRY_AFTER:
+            logger.warning(
+                f"Request to {host} was throttled for {delay:.0f}s, longer than "
+                f"the {MAX_RETRY_AFTER:.0f}s limit. Giving up on it"
+            )
+            self.bucket(host).throttle(MAX_RETRY_AFTER)
+            return None
+        logger.warning(
+            f"Request to {host} was throttled. Backing off for {delay:.1f}s "
+            f"(attempt {attempt + 1})"
+        )
+        self.bucket(host).throttle(delay)
+        return delay
+
+
+def parse_retry_after(value: str | float | None) -> float | None:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value (str | float | None): Delay in seconds or an HTTP date.
+
+    Returns:
+        float | None: The delay in seconds, or None if it cannot be parsed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at: datetime = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # Dates with a -0000 offset are parsed as naive UTC times
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, retry_after: str | float | None = None) -> float:
+    """
+    Compute how long to wait before retrying a throttled request.
+
+    Retry-After is honoured in full when present, otherwise exponential
+    backoff with full jitter capped at BACKOFF_CAP is used.
+
+    Args:
+        attempt (int): Zero-based number of the retry about to be made.
+        retry_after (str | float | None): Value of the Retry-After header.
+
+    Returns:
+        float: Delay in seconds.
+    """
+    server_delay: float | None = parse_retry_after(retry_after)
+    if server_delay is not None:
+        return server_delay
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+
+
+def parse_host_rate(value: str) -> tuple[str, float]:
+    """
+    Parse a per-host rate written as HOST=REQUESTS_PER_SECOND.
+
+    Raises:
+        ValueError: If the value is malformed or the rate is not positive.
+    """
+    host, separator, rate = value.partition("=")
+    if not separator or not host.strip():
+        raise ValueError(f"expected HOST=REQUESTS_PER_SECOND, got {value!r}")
+    requests_per_second = float(rate)
+    if requests_per_second <= 0:
+        raise ValueError(f"rate must be positive, got {rate!r}")
+    return host.strip(), requests_per_second
+
+
+def configure_rate_limiter(rates: dict[str, float] | None = None) -> RateLimiter:
+    """
+    Replace the shared rate limiter with one using the given rates.
+
+    Args:
+        rates (dict[str, float] | None): Requests per second per host.
+
+    Returns:
+        RateLimiter: The new shared limiter.
+    """
+    global _limiter
+    with _limiter_lock:
+        _limiter = RateLimiter(rates)
+        return _limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the rate limiter shared by all threads, creating it on first use.
+
+    Returns:
+        RateLimiter: The shared limiter.
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
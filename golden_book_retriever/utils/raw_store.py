@@ -0,0 +1,198 @@
+# raw_store.py
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterator
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = "data/books/raw_store"
+DEFAULT_SEGMENT_SIZE: int = 64 * 1024 * 1024
+
+
+class RawDataStore:
+    """
+    Compressed, content-addressed store for raw source responses.
+
+    Payloads are compressed and appended to segment files. Identical payloads
+    are stored once, identified by their SHA-256 hash. A SQLite index maps
+    each (folder, source) pair to the payload it was last saved with.
+
+    A payload is appended to its segment before the index is committed. Bytes
+    left behind by a save that never committed are truncated when the store
+    is opened again. The store is meant to be used by one process at a time.
+    """
+
+    def __init__(
+        self,
+        store_dir: str = DEFAULT_STORE_DIR,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+    ) -> None:
+        """
+        Open or create the store.
+
+        Args:
+            store_dir: Directory holding the segment files and the index.
+            segment_size: Size in bytes after which a new segment is started.
+        """
+        self.store_dir: Path = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_size: int = segment_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.store_dir / "index.sqlite3", check_same_thread=False
+        )
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                folder TEXT NOT NULL,
+                source TEXT NOT NULL,
+                hash TEXT NOT NULL REFERENCES blobs (hash),
+                saved_at REAL NOT NULL,
+                PRIMARY KEY (folder, source)
+            );
+            """
+        )
+        self._conn.commit()
+        row = self._conn.execute("SELECT MAX(segment) FROM blobs").fetchone()
+        self._segment: int = row[0] or 0
+        self._truncate_orphans()
+
+    def _truncate_orphans(self) -> None:
+        """Drop segment bytes written by saves whose index commit was lost."""
+        for path in self.store_dir.glob("segment-*.zlib"):
+            segment: int = int(path.stem.split("-", 1)[1])
+            row = self._conn.execute(
+                "SELECT MAX(offset + length) FROM blobs WHERE segment = ?", (segment,)
+            ).fetchone()
+            end: int = row[0] or 0
+            size: int = path.stat().st_size
+            if size > end:
+                logger.warning(
+                    f"Truncating {size - end} unindexed bytes from {path.name}"
+                )
+                with open(path, "r+b") as f:
+                    f.truncate(end)
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.store_dir / f"segment-{segment:05d}.zlib"
+
+    def put(self, folder: str, source: str, data: dict[str, Any] | None) -> None:
+        """
+        Save raw data for a (folder, source) pair.
+
+        Args:
+            folder: Name of the book folder, as used by the old layout.
+            source: Name of the data source.
+            data: Raw data to save, or None if no data was found.
+        """
+        if data is None:
+            data = {"status": "No data found"}
+
+        # Key order is kept so that export reproduces the original files
+        payload: bytes = json.dumps(
+            data, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        content_hash: str = hashlib.sha256(payload).hexdigest()
+
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM blobs WHERE hash = ?", (content_hash,)
+            ).fetchone()
+            try:
+                if not exists:
+                    self._append_blob(content_hash, zlib.compress(payload, 6))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (folder, source, hash, saved_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (folder, source, content_hash, time.time()),
+                )
+                self._conn.commit()
+            except Exception:
+                # Appended bytes are truncated the next time the store is opened
+                self._conn.rollback()
+                raise
+        logger.debug(
+            "Raw data for %s/%s stored as %s", folder, source, content_hash[:12]
+        )
+
+    def _append_blob(self, content_hash: str, record: bytes) -> None:
+        path: Path = self._segment_path(self._segment)
+        if path.exists() and path.stat().st_size + len(record) > self.segment_size:
+            self._segment += 1
+            path = self._segment_path(self._segment)
+
+        with open(path, "ab") as f:
+            offset: int = f.tell()
+            f.write(record)
+        self._conn.execute(
+            "INSERT INTO blobs (hash, segment, offset, length) VALUES (?, ?, ?, ?)",
+            (content_hash, self._segment, offset, len(record)),
+        )
+
+    def get(self, folder: str, source: str) -> dict[str, Any] | None:
+        """
+        Read the raw data saved for a (folder, source) pair.
+
+        Returns:
+            The raw data, or None if nothing was saved for the pair.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blobs.segment, blobs.offset, blobs.length FROM entries "
+                "JOIN blobs ON blobs.hash = entries.hash "
+                "WHERE entries.folder = ? AND entries.source = ?",
+                (folder, source),
+            ).fetchone()
+        if row is None:
+            return None
+
+        segment, offset, length = row
+        with open(self._segment_path(segment), "rb") as f:
+            f.seek(offset)
+            record: bytes = f.read(length)
+        return json.loads(zlib.decompress(record))
+
+    def entries(self) -> Iterator[tuple[str, str]]:
+        """Iterate over the stored (folder, source) pairs."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT folder, source FROM entries ORDER BY folder, source"
+            ).fetchall()
+        yield from rows
+
+    def export(self, output_dir: str) -> int:
+        """
+        Write every entry back out in the one-JSON-file-per-source layout.
+
+        Args:
+            output_dir: Directory to export to, e.g. "data/books/raw_data".
+
+        Returns:
+            The number of exported files.
+        """
+        exported = 0
+        for folder, source in self.entries():
+            base_path: Path = Path(output_dir) / folder
+            base_path.mkdir(parents=True, exist_ok=True)
+            with open(base_path / f"{source}_raw.json", "w", encoding="utf-8") as f:
+                json.dump(self.get(folder, source), f, ensure_ascii=False, indent=2)
+            exported += 1
+        logger.info(f"Exported {exported} raw data files to {output_dir}")
+        return exported
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,189 @@
+# response_cache.py
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .isbn_utils import isbn_key
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DAY: int = 24 * 60 * 60
+
+DEFAULT_CACHE_PATH = "data/cache/responses.sqlite3"
+DEFAULT_MAX_BYTES: int = 512 * 1024 * 1024
+
+# How long a cached response stays fresh, per source
+DEFAULT_TTLS: dict[str, int] = {
+    "OpenLibraryAPI": 30 * DAY,
+    "GoogleBooksAPI": 30 * DAY,
+    "GoodreadsScraper": 7 * DAY,
+}
+DEFAULT_TTL: int = 7 * DAY
+
+
+def _encode_value(obj: Any) -> Any:
+    """Convert sets to sorted lists for JSON serialization."""
+    if isinstance(obj, set):
+        return sorted(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ResponseCache:
+    """
+    Persistent single-file cache of source lookups.
+
+    Entries are keyed by source name, lookup kind and normalized query, expire
+    after a per-source TTL and are evicted least-recently-used first once the
+    cache grows past its size limit.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttls: dict[str, int] | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        refresh: bool = False,
+    ) -> None:
+        """
+        Open or create the cache.
+
+        Args:
+            path: Path to the SQLite file backing the cache.
+            ttls: Time to live in seconds per source name.
+            max_bytes: Total payload size after which old entries are evicted.
+            refresh: If True, cached entries are ignored but still rewritten.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttls: dict[str, int] = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes: int = max_bytes
+        self.refresh: bool = refresh
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+            "ON responses (accessed_at)"
+        )
+        self._conn.commit()
+        self._total_bytes: int = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def make_key(source: str, kind: str, query: Any) -> str:
+        """
+        Build the cache key for a lookup.
+
+        ISBN-10 and ISBN-13 forms of the same book map to the same key.
+
+        Args:
+            source (str): Name of the data source.
+            kind (str): Lookup kind: "isbn", "title_author" or "url".
+            query (Any): The ISBN, a (title, authors) pair or a URL.
+
+        Returns:
+            str: The cache key.
+        """
+        if kind == "isbn":
+            normalized: str = isbn_key(query)
+        elif kind == "title_author":
+            title, authors = query
+            normalized = "|".join(
+                [title.casefold().strip()]
+                + sorted(author.casefold().strip() for author in authors)
+            )
+        else:
+            normalized = str(query).strip()
+        return f"{source}:{kind}:{normalized}"
+
+    def get(self, source: str, kind: str, query: Any) -> dict[str, Any] | None:
+        """
+        Get a fresh cached response.
+
+        Returns:
+            The cached response, or None on a miss, expiry or refresh.
+        """
+        if self.refresh:
+            return None
+
+        key: str = self.make_key(source, kind, query)
+        now: float = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttls.get(source, DEFAULT_TTL):
+                logger.debug("Cached response for %s has expired", key)
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+
+        logger.debug("Cache hit for %s", key)
+        return json.loads(value)
+
+    def set(self, source: str, kind: str, query: Any, value: dict[str, Any]) -> None:
+        """Store a response, evicting old entries if the cache is full."""
+        key: str = self.make_key(source, kind, query)
+        try:
+            payload: str = json.dumps(value, ensure_ascii=False, default=_encode_value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Response for {key} cannot be cached: {str(e)}")
+            return
+
+        size: int = len(payload.encode("utf-8"))
+        now: float = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, source, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, source, payload, size, now, now),
+            )
+            self._total_bytes += size - (row[0] if row else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is below 90% full."""
+        target: int = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        evicted: list[tuple[str]] = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.debug("Evicted %d cached responses", len(evicted))
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
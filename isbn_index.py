@@ -0,0 +1,165 @@
+import bisect
+import json
+import logging
+import mmap
+import os
+import threading
+from array import array
+from pathlib import Path
+
+from data.catalog import BookCatalog
+from golden_book_retriever.utils import isbn_utils
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = Path("data/books_isbn13.idx")
+# Kept apart from the book file index, so switching to --catalog and back
+# does not leave either index missing the other backend's books
+DEFAULT_CATALOG_INDEX_PATH = Path("data/catalog_isbn13.idx")
+
+
+def isbn_key(isbn: str) -> int | None:
+    """
+    Convert an ISBN to the integer stored in the index.
+
+    Args:
+        isbn: An ISBN-10 or ISBN-13, with or without hyphens.
+
+    Returns:
+        The normalized ISBN-13 as an integer, or None if it is not one.
+    """
+    normalized: str = isbn_utils.isbn_key(isbn)
+    if len(normalized) != 13 or not normalized.isdigit():
+        return None
+    return int(normalized)
+
+
+class IsbnIndex:
+    """
+    On-disk index of the ISBNs that already have a file under data/books, or
+    a row in the catalog.
+
+    The index file is a sorted array of ISBN-13s stored as unsigned 64-bit
+    integers. It is memory-mapped and searched with a binary search. ISBNs
+    added during a run are kept in memory until `flush` merges them into the
+    file.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        books_dir: str = "data/books",
+        catalog: BookCatalog | None = None,
+    ) -> None:
+        """
+        Open the index, building it from the saved books if it does not exist.
+
+        Args:
+            path: Path to the index file. Defaults to DEFAULT_CATALOG_INDEX_PATH
+                with a catalog and DEFAULT_INDEX_PATH without one.
+            books_dir: Directory of book JSON files used to build a new index.
+            catalog: Catalog used to build a new index instead of books_dir.
+        """
+        if path is None:
+            path = DEFAULT_CATALOG_INDEX_PATH if catalog else DEFAULT_INDEX_PATH
+        self.path: Path = path
+        self._pending: set[int] = set()
+        self._lock = threading.Lock()
+        self._mmap: mmap.mmap | None = None
+        self._keys: memoryview | None = None
+
+        if not path.exists():
+            if catalog is not None:
+                self._build_from_catalog(catalog)
+            else:
+                self._build(Path(books_dir))
+        self._open()
+
+    def _build(self, books_dir: Path) -> None:
+        logger.info(f"Building ISBN index from {books_dir}")
+        keys: set[int] = set()
+        for book_file in books_dir.glob("*.json"):
+            try:
+                with open(book_file, "r", encoding="utf-8") as f:
+                    isbn = json.load(f).get("isbn")
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Could not read {book_file}: {str(e)}")
+                continue
+            key: int | None = isbn_key(isbn) if isbn else None
+            if key is not None:
+                keys.add(key)
+        self._write(keys)
+        logger.info(f"ISBN index built with {len(keys)} ISBNs")
+
+    def _build_from_catalog(self, catalog: BookCatalog) -> None:
+        logger.info("Building ISBN index from the catalog")
+        keys: set[int] = {
+            key for key in map(isbn_key, catalog.isbns()) if key is not None
+        }
+        self._write(keys)
+        logger.info(f"ISBN index built with {len(keys)} ISBNs")
+
+    def _write(self, keys: set[int]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path: Path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            array("Q", sorted(keys)).tofile(f)
+        os.replace(tmp_path, self.path)
+
+    def _close(self) -> None:
+        if self._keys is not None:
+            self._keys.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap, self._keys = None, None
+
+    def _open(self) -> None:
+        self._close()
+        if self.path.stat().st_size == 0:
+            return
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._keys = memoryview(self._mmap).cast("Q")
+
+    def __len__(self) -> int:
+        with self._lock:
+            stored: int = len(self._keys) if self._keys is not None else 0
+            return stored + len(self._pending)
+
+    def _contains_key(self, key: int) -> bool:
+        if key in self._pending:
+            return True
+        if self._keys is None:
+            return False
+        position: int = bisect.bisect_left(self._keys, key)
+        return position < len(self._keys) and self._keys[position] == key
+
+    def contains(self, isbn: str) -> bool:
+        """Check whether a book with this ISBN was already fetched."""
+        key: int | None = isbn_key(isbn)
+        if key is None:
+            return False
+        with self._lock:
+            return self._contains_key(key)
+
+    def add(self, isbn: str) -> None:
+        """Record that a book with this ISBN has been fetched."""
+        key: int | None = isbn_key(isbn)
+        if key is None:
+            return
+        with self._lock:
+            if not self._contains_key(key):
+                self._pending.add(key)
+
+    def flush(self) -> None:
+        """Merge ISBNs added since the last flush into the index file."""
+        with self._lock:
+            if not self._pending:
+                return
+            keys: set[int] = set(self._keys) if self._keys is not None else set()
+            keys |= self._pending
+            self._pending.clear()
+            # The file must be unmapped before it can be replaced
+            self._close()
+            self._write(keys)
+            self._open()
@@ -1,26 +1,49 @@
-import os
 import sys
 import argparse
 import logging
-from typing import Any
-from agent_notion.uploader import upload_books_to_notion
-from golden_book_retriever.retriever import Retriever
+from logging.handlers import QueueListener
 from error_handler import setup_error_handling
-from book_processor import BookProcessor
+from golden_book_retriever.completeness import EARLY_EXIT_MODES, CompletenessPolicy
+from golden_book_retriever.utils.log_utils import (
+    DEFAULT_PAYLOAD_LIMIT,
+    configure_payload_limit,
+    start_queue_logging,
+)
+from golden_book_retriever.utils.metrics import (
+    DEFAULT_TEXTFILE_INTERVAL,
+    PrometheusTextfileWriter,
+    get_metrics,
+)
+from profiling import (
+    DEFAULT_SNAPSHOT_EVERY,
+    PROFILE_MODES,
+    PROFILE_TARGETS,
+    StageProfiler,
+)
 
+# Subsystems are imported by the command that uses them, so that a single-ISBN
+# run does not load the Notion client and an upload does not load the sources
 
-def setup_logging(debug: bool = True) -> None:
+
+def setup_logging(
+    debug: bool = True, payload_limit: int = DEFAULT_PAYLOAD_LIMIT
+) -> QueueListener:
     log_level: int = logging.DEBUG if debug else logging.INFO
 
-    # Configure the root logger
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler("golden_book_retriever.log", encoding="utf-8"),
-        ],
+    # Configure the root logger. Console and file output are written by a
+    # background thread, so workers never wait on the disk.
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
+    handlers: list[logging.Handler] = [
+        logging.StreamHandler(sys.stdout),
+        logging.FileHandler("golden_book_retriever.log", encoding="utf-8"),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    listener: QueueListener = start_queue_logging(handlers)
+    logging.root.setLevel(log_level)
+    configure_payload_limit(payload_limit)
 
     # Set the log level for all loggers
     for logger_name in logging.root.manager.loggerDict:
@@ -30,6 +53,7 @@ def setup_logging(debug: bool = True) -> None:
     # Ensure that the main logger is also set to the correct level
     logger = logging.getLogger(__name__)
     logger.setLevel(log_level)
+    return listener
 
 
 setup_error_handling(
@@ -43,6 +67,28 @@ setup_error_handling(
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+def positive_int(value: str) -> int:
+    """Argument type accepting whole numbers of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """Argument type accepting finite numbers greater than 0."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}") from None
+    if not 0 < number < float("inf"):
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
 def main() -> None:
     """
     Main function to run the Golden Book Retriever.
@@ -58,30 +104,216 @@ def main() -> None:
     parser.add_argument(
         "--goodreads-file", help="File containing list of Goodreads URLs", type=str
     )
+    parser.add_argument(
+        "--goodreads-export",
+        help="Goodreads library export CSV to fetch the books of",
+        type=str,
+    )
+    parser.add_argument(
+        "--workers",
+        help="Number of books fetched from a file or uploaded concurrently",
+        type=positive_int,
+        default=1,
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip items completed by a previous run of the same file",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Disable the source response cache"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help=(
+            "Ignore cached source responses and fetch them again, "
+            "including ISBNs that already have a book file"
+        ),
+    )
+    parser.add_argument(
+        "--no-known-misses",
+        action="store_true",
+        help="Look up ISBNs even on sources that recently had no book for them",
+    )
+    parser.add_argument(
+        "--openlibrary-dump",
+        action="store_true",
+        help="Look up Open Library data in the local dump index instead of the API",
+    )
+    parser.add_argument(
+        "--build-openlibrary-index",
+        nargs="+",
+        metavar="DUMP",
+        help="Build the local Open Library index from dump files (.txt or .txt.gz)",
+    )
+    parser.add_argument(
+        "--early-exit",
+        choices=EARLY_EXIT_MODES,
+        help=(
+            "Query the primary sources first and skip the others for books they "
+            "complete, or fetch the others in the background"
+        ),
+    )
+    parser.add_argument(
+        "--completeness-policy",
+        help="JSON file with the required fields and trusted and primary sources",
+        type=str,
+    )
+    parser.add_argument(
+        "--raw-store",
+        action="store_true",
+        help="Save raw source data to the compressed store instead of JSON files",
+    )
+    parser.add_argument(
+        "--export-raw",
+        help="Export the compressed raw data store as JSON files into a directory",
+        type=str,
+    )
+    parser.add_argument(
+        "--catalog",
+        action="store_true",
+        help="Save and upload books using the SQLite catalog instead of JSON files",
+    )
+    parser.add_argument(
+        "--import-catalog",
+        action="store_true",
+        help="Import the book JSON files in data/books into the catalog",
+    )
+    parser.add_argument(
+        "--export-catalog",
+        help="Export the catalog as book JSON files into a directory",
+        type=str,
+    )
     parser.add_argument("--upload", action="store_true", help="Upload books to Notion")
+    parser.add_argument(
+        "--preload-index",
+        action="store_true",
+        help="Load the Notion database once and check for existing books locally",
+    )
+    parser.add_argument(
+        "--ignore-manifest",
+        action="store_true",
+        help="Re-check every book file, even those unchanged since the last upload",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write Prometheus metrics to this file for the textfile collector",
+        type=str,
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        help="Seconds between two writes of --metrics-file (default: 15)",
+        type=positive_float,
+        default=DEFAULT_TEXTFILE_INTERVAL,
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="Profile CPU time (cProfile) or memory allocations (tracemalloc)",
+    )
+    parser.add_argument(
+        "--profile-stage",
+        choices=tuple(PROFILE_TARGETS),
+        default="all",
+        help="Only profile this stage of the pipeline (default: all)",
+    )
+    parser.add_argument(
+        "--profile-every",
+        help="Write a profile snapshot every N books (default: 100)",
+        type=int,
+        default=DEFAULT_SNAPSHOT_EVERY,
+    )
+    parser.add_argument(
+        "--rate",
+        action="append",
+        metavar="HOST=RPS",
+        help=(
+            "Requests per second allowed for a host, e.g. openlibrary.org=1.5; "
+            "may be given several times"
+        ),
+    )
     parser.add_argument("--no-debug", action="store_true", help="Disable debug logging")
+    parser.add_argument(
+        "--log-payload-limit",
+        help=(
+            "Truncate book data and API responses in log messages to this many "
+            "characters; 0 logs them in full (default: 500)"
+        ),
+        type=int,
+        default=DEFAULT_PAYLOAD_LIMIT,
+    )
 
     args: argparse.Namespace = parser.parse_args()
 
-    setup_logging(not args.no_debug)
+    if args.rate:
+        from golden_book_retriever.utils.rate_limiter import (
+            configure_rate_limiter,
+            parse_host_rate,
+        )
+
+        try:
+            configure_rate_limiter(dict(parse_host_rate(rate) for rate in args.rate))
+        except ValueError as e:
+            parser.error(f"argument --rate: {e}")
+
+    log_listener: QueueListener = setup_logging(
+        not args.no_debug, payload_limit=args.log_payload_limit
+    )
+
+    metrics_writer: PrometheusTextfileWriter | None = None
+    if args.metrics_file:
+        metrics_writer = PrometheusTextfileWriter(
+            args.metrics_file, interval=args.metrics_interval
+        )
+        metrics_writer.start()
+
+    profiler: StageProfiler | None = None
+    if args.profile:
+        profiler = StageProfiler(
+            args.profile, target=args.profile_stage, snapshot_every=args.profile_every
+        )
+        profiler.start()
 
     try:
-        retriever = Retriever()
-        processor = BookProcessor(retriever)
+        if args.build_openlibrary_index:
+            from golden_book_retriever.sources.openlibrary_dump import (
+                build_dump_index,
+            )
+
+            build_dump_index(args.build_openlibrary_index)
+        elif args.export_raw:
+            from golden_book_retriever.utils.raw_store import RawDataStore
+
+            RawDataStore().export(args.export_raw)
+        elif args.import_catalog:
+            from data.catalog import BookCatalog
+
+            BookCatalog().import_directory("data/books")
+        elif args.export_catalog:
+            from data.catalog import BookCatalog
+
+            BookCatalog().export_directory(args.export_catalog)
+        elif args.upload:
+            from agent_notion.uploader import upload_books_to_notion
+            from data.catalog import BookCatalog
 
-        if args.upload:
             logger.info("Uploading books to Notion")
-            upload_books_to_notion("data/books")
-        elif args.isbn_file:
-            logger.info(f"Processing ISBNs from file: {args.isbn_file}")
-            processor.process_file(args.isbn_file, processor.process_isbn)
-        elif args.goodreads_file:
-            logger.info(f"Processing Goodreads URLs from file: {args.goodreads_file}")
-            processor.process_file(args.goodreads_file, processor.process_goodreads_url)
-        elif args.isbn:
-            processor.process_isbn(args.isbn)
-        elif args.title and args.author:
-            processor.process_title_author(args.title, set(args.author))
+            upload_books_to_notion(
+                "data/books",
+                preload_index=args.preload_index,
+                workers=args.workers,
+                use_manifest=not args.ignore_manifest,
+                catalog=BookCatalog() if args.catalog else None,
+            )
+        elif (
+            args.isbn_file
+            or args.goodreads_file
+            or args.goodreads_export
+            or args.isbn
+            or (args.title and args.author)
+        ):
+            fetch_books(args)
         else:
             logger.error("Invalid arguments. Use --help for usage information.")
             sys.exit(1)
@@ -89,6 +321,98 @@ def main() -> None:
     except Exception as e:
         logger.exception(f"An unexpected error occurred: {e!r}")
         sys.exit(1)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        if metrics_writer is not None:
+            metrics_writer.stop()
+        logger.info("Run metrics:\n%s", get_metrics().summary())
+        log_listener.stop()
+
+
+def fetch_books(args: argparse.Namespace) -> None:
+    """
+    Fetch book data for the ISBN, Goodreads URL, Goodreads export or title and
+    author commands.
+
+    Args:
+        args: Parsed command-line arguments.
+    """
+    import constants
+    from book_processor import BookProcessor
+    from data.catalog import BookCatalog
+    from golden_book_retriever.retriever import Retriever
+    from golden_book_retriever.sources.openlibrary_dump import OpenLibraryDump
+    from golden_book_retriever.utils.http_session import (
+        DEFAULT_POOL_MAXSIZE,
+        configure_session,
+    )
+    from golden_book_retriever.utils.miss_registry import MissRegistry
+    from golden_book_retriever.utils.raw_store import RawDataStore
+    from golden_book_retriever.utils.response_cache import ResponseCache
+    from isbn_index import IsbnIndex
+
+    # Sources read their API keys from the environment when they are built
+    constants.load_environment()
+
+    # Every book in flight may hold one connection per source host
+    configure_session(pool_maxsize=max(DEFAULT_POOL_MAXSIZE, args.workers))
+    cache: ResponseCache | None = (
+        None if args.no_cache else ResponseCache(refresh=args.refresh)
+    )
+    completeness_policy: CompletenessPolicy | None = None
+    if args.early_exit or args.completeness_policy:
+        background: bool = args.early_exit == "background"
+        completeness_policy = (
+            CompletenessPolicy.from_file(args.completeness_policy, background)
+            if args.completeness_policy
+            else CompletenessPolicy(background=background)
+        )
+    retriever = Retriever(
+        workers=args.workers,
+        cache=cache,
+        raw_store=RawDataStore() if args.raw_store else None,
+        openlibrary_dump=OpenLibraryDump() if args.openlibrary_dump else None,
+        completeness_policy=completeness_policy,
+        miss_registry=(
+            None if args.no_known_misses else MissRegistry(refresh=args.refresh)
+        ),
+    )
+    catalog: BookCatalog | None = BookCatalog() if args.catalog else None
+    isbn_index: IsbnIndex | None = (
+        IsbnIndex(catalog=catalog)
+        if (args.isbn or args.isbn_file or args.goodreads_export) and not args.refresh
+        else None
+    )
+    processor = BookProcessor(retriever, isbn_index=isbn_index, catalog=catalog)
+
+    if args.isbn_file:
+        logger.info(f"Processing ISBNs from file: {args.isbn_file}")
+        processor.process_file(
+            args.isbn_file,
+            processor.process_isbn,
+            workers=args.workers,
+            resume=args.resume,
+        )
+    elif args.goodreads_file:
+        logger.info(f"Processing Goodreads URLs from file: {args.goodreads_file}")
+        processor.process_file(
+            args.goodreads_file,
+            processor.process_goodreads_url,
+            workers=args.workers,
+            resume=args.resume,
+        )
+    elif args.goodreads_export:
+        logger.info(f"Processing Goodreads export: {args.goodreads_export}")
+        processor.process_goodreads_export(
+            args.goodreads_export, workers=args.workers, resume=args.resume
+        )
+    elif args.isbn:
+        processor.process_isbn(args.isbn)
+        if isbn_index is not None:
+            isbn_index.flush()
+    else:
+        processor.process_title_author(args.title, set(args.author))
 
 
 if __name__ == "__main__":
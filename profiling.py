@@ -0,0 +1,202 @@
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from golden_book_retriever.utils.metrics import Metrics, get_metrics
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+PROFILE_MODES: tuple[str, ...] = ("cpu", "mem")
+
+# Metric stages profiled for each --profile-stage target; None means all stages
+PROFILE_TARGETS: dict[str, frozenset[str] | None] = {
+    "all": None,
+    "fetch": frozenset({"fetch"}),
+    "extract": frozenset({"extract"}),
+    "upload": frozenset({"notion_exists", "notion_create", "notion_append"}),
+}
+
+# Allocation sites kept in memory reports for each --profile-stage target
+MEMORY_FILTERS: dict[str, tuple[str, ...]] = {
+    "all": (),
+    "fetch": ("*/golden_book_retriever/*",),
+    "extract": ("*/golden_book_retriever/sources/goodreads/*",),
+    "upload": ("*/agent_notion/*", "*/notion_client/*"),
+}
+
+# Stages finished exactly once per processed book, used to count books
+BOOK_STAGES: frozenset[str] = frozenset({"write", "notion_exists"})
+
+DEFAULT_PROFILE_DIR = "data/profiles"
+DEFAULT_SNAPSHOT_EVERY = 100
+TOP_ENTRIES = 25
+SUMMARY_ENTRIES = 10
+TRACEMALLOC_FRAMES = 10
+
+
+class StageProfiler:
+    """
+    CPU or memory profiler driven by the pipeline's stage metrics.
+
+    In CPU mode, a thread entering a targeted stage gets a fresh
+    cProfile.Profile, which is merged into a shared pstats.Stats once the
+    thread leaves the outermost targeted stage. Only one stage call is
+    profiled at a time, since an interpreter supports a single active
+    profiler; calls that start while another is profiled are skipped, so with
+    several workers the profile covers a sample of the calls. In memory mode,
+    tracemalloc traces the whole process and reports are filtered to the
+    modules of the targeted stage. A snapshot is written every
+    `snapshot_every` books and at the end of the run.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        target: str = "all",
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+        output_dir: str = DEFAULT_PROFILE_DIR,
+        metrics: Metrics | None = None,
+    ) -> None:
+        """
+        Args:
+            mode: "cpu" or "mem".
+            target: One of PROFILE_TARGETS.
+            snapshot_every: Number of books between two snapshots.
+            output_dir: Directory where a subdirectory per run is created.
+            metrics: Registry whose stages drive the profiler. Defaults to the
+                shared one.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode!r}")
+        if target not in PROFILE_TARGETS:
+            raise ValueError(f"Unknown profile target: {target!r}")
+        self.mode: str = mode
+        self.target: str = target
+        self.stages: frozenset[str] | None = PROFILE_TARGETS[target]
+        self.snapshot_every: int = max(1, snapshot_every)
+        self.output_dir: Path = (
+            Path(output_dir) / f"{time.strftime('%Y%m%d-%H%M%S')}_{mode}_{target}"
+        )
+        self.metrics: Metrics = metrics or get_metrics()
+        self.books = 0
+        self._stats: pstats.Stats | None = None
+        self._lock = threading.Lock()
+        # Held by the thread whose stage call is being profiled
+        self._profiling = threading.Lock()
+        self._local = threading.local()
+
+    def start(self) -> None:
+        """Start profiling."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self.mode == "mem":
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.metrics.add_listener(self)
+        logger.info(
+            f"Profiling {self.mode} for stage {self.target!r}, "
+            f"writing to {self.output_dir}"
+        )
+
+    def stop(self) -> None:
+        """Stop profiling, write the final snapshot and log a summary."""
+        self.metrics.remove_listener(self)
+        self._write_snapshot("final")
+        logger.info(f"Profile summary ({self.books} books):\n{self.summary()}")
+        if self.mode == "mem":
+            tracemalloc.stop()
+
+    def _targeted(self, stage: str) -> bool:
+        return self.stages is None or stage in self.stages
+
+    def stage_started(self, stage: str, source: str) -> None:
+        if self.mode != "cpu" or not self._targeted(stage):
+            return
+        depth: int = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        if depth > 0:
+            return
+        self._local.profile = None
+        if not self._profiling.acquire(blocking=False):
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiling tool is active in this interpreter
+            self._profiling.release()
+            return
+        self._local.profile = profile
+
+    def stage_finished(
+        self, stage: str, source: str, seconds: float, error: bool
+    ) -> None:
+        if self.mode == "cpu" and self._targeted(stage):
+            self._local.depth -= 1
+            profile: cProfile.Profile | None = self._local.profile
+            if self._local.depth == 0 and profile is not None:
+                profile.disable()
+                self._local.profile = None
+                self._profiling.release()
+                with self._lock:
+                    if self._stats is None:
+                        self._stats = pstats.Stats(profile)
+                    else:
+                        self._stats.add(profile)
+
+        if stage in BOOK_STAGES:
+            with self._lock:
+                self.books += 1
+                books: int = self.books
+            if books % self.snapshot_every == 0:
+                self._write_snapshot(f"{books:06d}books")
+
+    def _write_snapshot(self, label: str) -> None:
+        if self.mode == "cpu":
+            path: Path = self.output_dir / f"cpu_{label}.pstats"
+            with self._lock:
+                if self._stats is None:
+                    return
+                self._stats.dump_stats(path)
+        else:
+            path = self.output_dir / f"mem_{label}.txt"
+            path.write_text(self._memory_report(TOP_ENTRIES), encoding="utf-8")
+        logger.debug(f"Profile snapshot written to {path}")
+
+    def _memory_report(self, limit: int) -> str:
+        snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+        patterns: tuple[str, ...] = MEMORY_FILTERS[self.target]
+        if patterns:
+            snapshot = snapshot.filter_traces(
+                [
+                    tracemalloc.Filter(True, pattern, all_frames=True)
+                    for pattern in patterns
+                ]
+            )
+        current, peak = tracemalloc.get_traced_memory()
+        lines: list[str] = [
+            f"Traced memory: current {current / 1024 / 1024:.1f} MiB, "
+            f"peak {peak / 1024 / 1024:.1f} MiB",
+            f"Top {limit} allocation sites:",
+        ]
+        for statistic in snapshot.statistics("lineno")[:limit]:
+            lines.append(f"  {statistic}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Render the hottest functions or largest allocation sites."""
+        if self.mode == "mem":
+            return self._memory_report(SUMMARY_ENTRIES)
+        with self._lock:
+            if self._stats is None:
+                return "No profiled stage calls"
+            output = io.StringIO()
+            self._stats.stream = output  # type: ignore[attr-defined]
+            self._stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                SUMMARY_ENTRIES
+            )
+            self._stats.sort_stats(pstats.SortKey.TIME).print_stats(SUMMARY_ENTRIES)
+        return output.getvalue()
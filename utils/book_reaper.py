@@ -1,13 +1,14 @@
 import os
 from notion_client import Client
 
-from constants import NOTION_DATABASE_ID
+import constants
 
 
 class BookReaper:
     def __init__(self) -> None:
+        constants.load_environment()
         self.notion = Client(auth=os.environ["NOTION_SECRET"])
-        self.database_id: str = NOTION_DATABASE_ID
+        self.database_id: str = constants.NOTION_DATABASE_ID
 
     def reap_all_books(self) -> list[dict]:
         """Reap all books from the Notion database."""